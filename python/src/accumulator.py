@@ -0,0 +1,239 @@
+import heapq
+import os
+import pickle
+import shutil
+import sys
+import tempfile
+from array import array
+from bisect import bisect_left
+from itertools import groupby
+from numbers import Number
+from operator import itemgetter
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .quant import Expression, Symbol, Integer, Sign, product
+from .numeric import monomials
+from .writer import to_string
+
+# key, coefficient and the factors of the monomial without its coefficient
+Entry = Tuple[str, Number, Tuple[Expression, ...]]
+
+# dict slot, the entry list and the coefficient, the factors themselves are
+# shared with the expression the term came from
+ENTRY_BYTES = 200
+MAX_RUNS = 64
+BUFFER_SIZE = 1 << 16
+
+
+class Accumulator:
+    def __init__(self, memory_limit: int = 256 << 20, directory: Optional[str] = None):
+        self.memory_limit = memory_limit
+        self.runs: List[str] = []
+
+        self._entries: Dict[str, list] = {}
+        self._size = 0
+        self._own_directory = directory is None
+        self.directory = tempfile.mkdtemp(prefix='accumulator-') if directory is None else directory
+
+    def __enter__(self) -> 'Accumulator':
+        return self
+
+    def __exit__(self, *exception):
+        self.close()
+
+    def add(self, expression: Expression):
+        for term_factors, sign in monomials(expression):
+            coefficient = sign.number()
+            symbols = []
+
+            for factor in term_factors:
+                if isinstance(factor, Integer):
+                    coefficient *= factor.number
+                else:
+                    symbols.append(factor)
+
+            self.add_monomial(tuple(symbols), coefficient)
+
+    def add_monomial(self, symbols: Tuple[Expression, ...], coefficient: Number):
+        # Scalars commute, so they are sorted to give every monomial a single
+        # key. Operators, bras and kets keep the order they were written in.
+        scalars = sorted((f for f in symbols if isinstance(f, (Symbol, Integer))), key=repr)
+        symbols = tuple(scalars + [f for f in symbols if not isinstance(f, (Symbol, Integer))])
+        key = to_string(product(symbols))
+        entry = self._entries.get(key)
+
+        if entry is not None:
+            entry[0] += coefficient
+            return
+
+        self._entries[key] = [coefficient, symbols]
+        self._size += sys.getsizeof(key) + sys.getsizeof(symbols) + ENTRY_BYTES
+
+        if self._size > self.memory_limit:
+            self.spill()
+
+    def spill(self):
+        if len(self._entries) == 0:
+            return
+
+        entries = (
+            (key, coefficient, symbols)
+            for key, (coefficient, symbols) in sorted(self._entries.items())
+        )
+        self.runs.append(self._write_run(entries))
+
+        self._entries = {}
+        self._size = 0
+
+        if len(self.runs) >= MAX_RUNS:
+            # Merged runs keep the number of files open at once bounded.
+            runs, self.runs = self.runs, []
+            self.runs.append(self._write_run(_merge([_read_run(path) for path in runs])))
+            for path in runs:
+                os.remove(path)
+
+    def entries(self) -> Iterator[Entry]:
+        memory = sorted(
+            (key, coefficient, symbols)
+            for key, (coefficient, symbols) in self._entries.items()
+        )
+        yield from _merge([_read_run(path) for path in self.runs] + [iter(memory)])
+
+    def items(self) -> Iterator[Tuple[str, Number]]:
+        for key, coefficient, _ in self.entries():
+            yield key, coefficient
+
+    def terms(self) -> Iterator[Expression]:
+        for _, coefficient, symbols in self.entries():
+            scalars = [] if coefficient == 1 else [_scalar(coefficient)]
+            yield product(scalars + list(symbols))
+
+    def to_table(self, path: str) -> 'Table':
+        os.makedirs(path, exist_ok=True)
+        offsets = array('q', [0])
+
+        with open(os.path.join(path, 'keys'), 'wb') as keys, open(os.path.join(path, 'coefficients'), 'wb') as values:
+            coefficients = array('d')
+
+            for key, coefficient in self.items():
+                encoded = key.encode()
+                keys.write(encoded)
+                offsets.append(offsets[-1] + len(encoded))
+
+                # interleaved real and imaginary parts are the complex128 layout
+                coefficient = complex(coefficient)
+                coefficients.extend((coefficient.real, coefficient.imag))
+
+                if len(coefficients) >= BUFFER_SIZE:
+                    coefficients.tofile(values)
+                    coefficients = array('d')
+
+            coefficients.tofile(values)
+
+        with open(os.path.join(path, 'offsets'), 'wb') as stream:
+            offsets.tofile(stream)
+
+        return Table(path)
+
+    def close(self):
+        for path in self.runs:
+            if os.path.exists(path):
+                os.remove(path)
+        self.runs = []
+        self._entries = {}
+
+        if self._own_directory:
+            shutil.rmtree(self.directory, ignore_errors=True)
+
+    def _write_run(self, entries: Iterable[Entry]) -> str:
+        descriptor, path = tempfile.mkstemp(suffix='.run', dir=self.directory)
+
+        with os.fdopen(descriptor, 'wb') as stream:
+            pickler = pickle.Pickler(stream)
+            for entry in entries:
+                pickler.dump(entry)
+                # each record is read back on its own
+                pickler.clear_memo()
+
+        return path
+
+
+class Table:
+    # A sorted table of monomial keys and their coefficients, read through
+    # memory maps so that it never has to be loaded as a whole.
+    def __init__(self, path: str):
+        import numpy
+
+        self.path = path
+        self.offsets = _memmap(os.path.join(path, 'offsets'), numpy.int64)
+        self.coefficients = _memmap(os.path.join(path, 'coefficients'), numpy.complex128)
+        self.keys = _memmap(os.path.join(path, 'keys'), numpy.uint8)
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def key(self, index: int) -> str:
+        return bytes(self.keys[self.offsets[index]:self.offsets[index + 1]]).decode()
+
+    def __getitem__(self, index: int) -> Tuple[str, complex]:
+        if not 0 <= index < len(self):
+            raise IndexError(f'{index} is out of range for a table of {len(self)} terms')
+        return self.key(index), complex(self.coefficients[index])
+
+    def __iter__(self) -> Iterator[Tuple[str, complex]]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def find(self, key: str) -> Optional[complex]:
+        index = bisect_left(_Keys(self), key)
+
+        if index < len(self) and self.key(index) == key:
+            return complex(self.coefficients[index])
+        return None
+
+
+class _Keys:
+    def __init__(self, table: Table):
+        self.table = table
+
+    def __len__(self) -> int:
+        return len(self.table)
+
+    def __getitem__(self, index: int) -> str:
+        return self.table.key(index)
+
+
+def _merge(runs: List[Iterator[Entry]]) -> Iterator[Entry]:
+    for key, group in groupby(heapq.merge(*runs, key=itemgetter(0)), key=itemgetter(0)):
+        coefficient, symbols = 0, None
+
+        for _, part, part_symbols in group:
+            coefficient += part
+            symbols = part_symbols if symbols is None else symbols
+
+        if coefficient != 0:
+            yield key, coefficient, symbols
+
+
+def _read_run(path: str) -> Iterator[Entry]:
+    with open(path, 'rb') as stream:
+        while True:
+            try:
+                yield pickle.load(stream)
+            except EOFError:
+                return
+
+
+def _scalar(coefficient: Number) -> Expression:
+    if coefficient.real != 0 and coefficient.imag != 0:
+        return Integer.from_number(coefficient.real) + Integer.from_number(coefficient.imag).mul_sign(Sign.IMAGINARY)
+    return Integer.from_number(coefficient)
+
+
+def _memmap(path: str, dtype):
+    import numpy
+
+    # numpy cannot map an empty file
+    if os.path.getsize(path) == 0:
+        return numpy.zeros(0, dtype=dtype)
+    return numpy.memmap(path, dtype=dtype, mode='r')
@@ -0,0 +1,239 @@
+import asyncio
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from itertools import islice
+from typing import Callable, Iterable, Iterator, List, Optional
+
+from .quant import Expression, expand, simplify, expanded_terms, term_count, balanced_summation, is_zero
+from .writer import write
+
+
+class Cancelled(Exception):
+    pass
+
+
+@dataclass(frozen=True)
+class Progress:
+    done: int
+    total: int
+    elapsed: float
+    resumed: int = 0
+
+    @property
+    def remaining(self) -> int:
+        return self.total - self.done
+
+    @property
+    def estimated_seconds(self) -> Optional[float]:
+        # The rate is measured on this run only, resumed terms were free.
+        if self.done == self.resumed:
+            return None
+        return self.elapsed / (self.done - self.resumed) * self.remaining
+
+
+class Job:
+    def __init__(
+            self,
+            expression: Expression,
+            checkpoint: Optional[str] = None,
+            chunk_size: int = 1000,
+            checkpoint_interval: float = 30.0,
+            progress: Optional[Callable[[Progress], None]] = None
+        ):
+        self.expression = expression
+        self.checkpoint = checkpoint
+        self.chunk_size = chunk_size
+        self.checkpoint_interval = checkpoint_interval
+        self.progress = progress
+
+        self.total = term_count(expression)
+        self.done = 0
+        self.results: List[Expression] = []
+
+        self._fingerprint = _fingerprint(expression)
+        self._cancelled = threading.Event()
+        self._lock = threading.Lock()
+        self._terms: Optional[Iterator[Expression]] = None
+        self._last_checkpoint = time.monotonic()
+
+        if checkpoint is not None and os.path.exists(checkpoint):
+            self._load()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    @property
+    def finished(self) -> bool:
+        return self.done >= self.total
+
+    def result(self) -> Expression:
+        return balanced_summation(self.results)
+
+    def run(self) -> Expression:
+        started = time.monotonic()
+        started_at = self.done
+
+        while not self.finished:
+            self._check_cancelled()
+            self._run_chunk()
+            self._report(started, started_at)
+
+        self._save()
+        return self.result()
+
+    async def run_async(self) -> Expression:
+        loop = asyncio.get_running_loop()
+        started = time.monotonic()
+        started_at = self.done
+
+        while not self.finished:
+            self._check_cancelled()
+            chunk = loop.run_in_executor(None, self._run_chunk)
+
+            try:
+                await asyncio.shield(chunk)
+            except asyncio.CancelledError:
+                # The executor thread cannot be interrupted, the snapshot is
+                # only taken once it has finished the chunk.
+                await chunk
+                self._save()
+                raise
+
+            self._report(started, started_at)
+
+        self._save()
+        return self.result()
+
+    def _run_chunk(self):
+        if self._terms is None:
+            self._terms = islice(expanded_terms(self.expression), self.done, None)
+
+        for term in islice(self._terms, self.chunk_size):
+            result = normalize(term)
+
+            with self._lock:
+                if not is_zero(result):
+                    self.results.append(result)
+                self.done += 1
+
+        if time.monotonic() - self._last_checkpoint >= self.checkpoint_interval:
+            self._save()
+
+    def _check_cancelled(self):
+        if self._cancelled.is_set():
+            self._save()
+            raise Cancelled(f'cancelled after {self.done} of {self.total} terms')
+
+    def _report(self, started: float, started_at: int):
+        if self.progress is None:
+            return
+
+        elapsed = time.monotonic() - started
+        self.progress(Progress(self.done, self.total, elapsed, started_at))
+
+    def _save(self):
+        self._last_checkpoint = time.monotonic()
+
+        if self.checkpoint is None:
+            return
+
+        with self._lock:
+            state = {
+                'fingerprint': self._fingerprint,
+                'done': self.done,
+                'results': list(self.results),
+            }
+
+        # every writer gets its own temporary file, the last rename wins
+        directory, name = os.path.split(os.path.abspath(self.checkpoint))
+        descriptor, temporary = tempfile.mkstemp(prefix=f'{name}.', suffix='.tmp', dir=directory)
+        try:
+            with os.fdopen(descriptor, 'wb') as stream:
+                pickle.dump(state, stream)
+            os.replace(temporary, self.checkpoint)
+        except BaseException:
+            os.remove(temporary)
+            raise
+
+    def _load(self):
+        with open(self.checkpoint, 'rb') as stream:
+            state = pickle.load(stream)
+
+        if state['fingerprint'] != self._fingerprint:
+            raise ValueError(f'checkpoint {self.checkpoint} belongs to a different expression')
+
+        self.done = state['done']
+        self.results = state['results']
+
+
+def normalize(term: Expression) -> Expression:
+    return simplify(expand(term))
+
+
+def run_threaded(
+        expression: Expression,
+        function: Callable[[Expression], Expression] = normalize,
+        workers: Optional[int] = None,
+        chunk_size: int = 100
+    ) -> Expression:
+    # Expression nodes are immutable, so the terms can be shared with the
+    # worker threads without copying or pickling them.
+    workers = min(32, (os.cpu_count() or 1) + 4) if workers is None else workers
+    results = []
+
+    with ThreadPoolExecutor(workers) as pool:
+        window = 2 * workers
+        pending = deque()
+
+        for chunk in _chunks(expanded_terms(expression), chunk_size):
+            pending.append(pool.submit(_apply, function, chunk))
+
+            if len(pending) >= window:
+                results.extend(pending.popleft().result())
+
+        while len(pending) > 0:
+            results.extend(pending.popleft().result())
+
+    return balanced_summation(result for result in results if not is_zero(result))
+
+
+def run(expression: Expression, **kwargs) -> Expression:
+    return Job(expression, **kwargs).run()
+
+
+async def run_async(expression: Expression, **kwargs) -> Expression:
+    return await Job(expression, **kwargs).run_async()
+
+
+def _apply(function: Callable[[Expression], Expression], terms: List[Expression]) -> List[Expression]:
+    return [function(term) for term in terms]
+
+
+def _chunks(terms: Iterable[Expression], size: int) -> Iterator[List[Expression]]:
+    terms = iter(terms)
+    while True:
+        chunk = list(islice(terms, size))
+        if len(chunk) == 0:
+            return
+        yield chunk
+
+
+class _HashStream:
+    def __init__(self):
+        self.digest = hashlib.sha256()
+
+    def write(self, text: str):
+        self.digest.update(text.encode())
+
+
+def _fingerprint(expression: Expression) -> str:
+    stream = _HashStream()
+    write(expression, stream)
+    return stream.digest.hexdigest()
@@ -0,0 +1,89 @@
+from dataclasses import dataclass
+from itertools import combinations
+from typing import List, Sequence
+
+import numpy
+
+from .quant import Expression, Symbol, FermionKet, Fd, F, product
+from .numeric import apply, to_mask, to_ket
+
+
+@dataclass(frozen=True)
+class ExcitationLevel:
+    level: int
+    determinants: numpy.ndarray
+    phases: numpy.ndarray
+    holes: numpy.ndarray
+    particles: numpy.ndarray
+
+    def __len__(self) -> int:
+        return len(self.phases)
+
+
+class ExcitationSpace:
+    def __init__(self, reference: FermionKet, orbitals: Sequence[Symbol], max_level: int = 2):
+        self.orbitals = list(orbitals)
+        self.reference, self.reference_sign = to_mask(reference, self.orbitals)
+        self.levels: List[ExcitationLevel] = []
+
+        n = len(self.orbitals)
+        dtype = numpy.uint64 if n <= 64 else object
+
+        occupied = [i for i in range(n) if self.reference >> i & 1]
+        virtual = [i for i in range(n) if not self.reference >> i & 1]
+
+        for level in range(min(max_level, len(occupied), len(virtual)) + 1):
+            determinants, phases, holes, particles = [], [], [], []
+
+            for hole in combinations(occupied, level):
+                for particle in combinations(virtual, level):
+                    mask, sign = apply(self.reference, _operators(hole, particle))
+
+                    determinants.append(mask)
+                    phases.append(sign * self.reference_sign)
+                    holes.append(hole)
+                    particles.append(particle)
+
+            self.levels.append(ExcitationLevel(
+                level,
+                numpy.array(determinants, dtype=dtype),
+                numpy.array(phases, dtype=numpy.int8),
+                numpy.array(holes, dtype=numpy.int32).reshape(len(holes), level),
+                numpy.array(particles, dtype=numpy.int32).reshape(len(particles), level),
+            ))
+
+    def __len__(self) -> int:
+        return sum(len(level) for level in self.levels)
+
+    def __getitem__(self, level: int) -> ExcitationLevel:
+        return self.levels[level]
+
+    @property
+    def determinants(self) -> numpy.ndarray:
+        return numpy.concatenate([level.determinants for level in self.levels])
+
+    @property
+    def phases(self) -> numpy.ndarray:
+        return numpy.concatenate([level.phases for level in self.levels])
+
+    def operator(self, level: int, index: int) -> Expression:
+        excitation = self.levels[level]
+        return product(
+            [Fd(self.orbitals[a]) for a in excitation.particles[index]]
+            + [F(self.orbitals[i]) for i in reversed(excitation.holes[index])]
+        )
+
+    def ket(self, level: int, index: int) -> FermionKet:
+        return to_ket(int(self.levels[level].determinants[index]), self.orbitals)
+
+
+def excitations(reference: FermionKet, orbitals: Sequence[Symbol], max_level: int = 2) -> ExcitationSpace:
+    return ExcitationSpace(reference, orbitals, max_level)
+
+
+def _operators(holes: Sequence[int], particles: Sequence[int]):
+    # a†_a1 ... a†_ak a_ik ... a_i1, so a_i1 acts first on the reference
+    return (
+        tuple((a, True) for a in particles)
+        + tuple((i, False) for i in reversed(holes))
+    )
@@ -0,0 +1,384 @@
+from dataclasses import dataclass
+from itertools import product as cartesian
+from typing import Dict, Hashable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from .quant import (
+    Sign,
+    Expression,
+    Symbol,
+    Integer,
+    Addition,
+    Multiplication,
+    FermionKet,
+    FermionBra,
+    FermionCreation,
+    FermionAnnihilation,
+    expand,
+    factors,
+    product,
+    balanced_summation,
+    is_zero,
+    terms,
+)
+
+Lattice = Dict[str, Sequence[Hashable]]
+
+
+@dataclass(frozen=True)
+class Index:
+    name: str
+    space: str
+    offset: int = 0
+
+    def __add__(self, shift: int) -> 'Index':
+        return Index(self.name, self.space, self.offset + shift)
+
+    def __sub__(self, shift: int) -> 'Index':
+        return Index(self.name, self.space, self.offset - shift)
+
+    def __repr__(self):
+        if self.offset == 0:
+            return self.name
+        return f'{self.name}{"+" if self.offset > 0 else "-"}{abs(self.offset)}'
+
+    def __str__(self):
+        return repr(self)
+
+
+Component = Union[Index, Hashable]
+
+
+class IndexedSymbol(Symbol):
+    def __init__(self, *indices: Component, sign: Sign = Sign.POSITIVE):
+        super().__init__('_'.join(str(index) for index in indices), sign)
+        self._set(indices=tuple(indices))
+
+    def __neg__(self):
+        return IndexedSymbol(*self.indices, sign=-self.sign)
+
+    def copy(self):
+        return IndexedSymbol(*self.indices, sign=self.sign)
+
+    def __hash__(self):
+        return hash((self.name, self.sign))
+
+
+class KroneckerDelta(Expression):
+    def __init__(self, lhs: Symbol, rhs: Symbol, sign: Sign = Sign.POSITIVE):
+        super().__init__(sign)
+        self._set(lhs=lhs, rhs=rhs)
+
+    def __repr__(self):
+        return f'{self.sign}δ({self.lhs},{self.rhs})'
+
+    def __neg__(self):
+        return KroneckerDelta(self.lhs, self.rhs, -self.sign)
+
+    def copy(self):
+        return KroneckerDelta(self.lhs, self.rhs, self.sign)
+
+    def __hash__(self) -> int:
+        return hash((self.sign, self.lhs, self.rhs))
+
+
+class IndexedSum(Expression):
+    def __init__(self, body: Expression, *indices: Index, sign: Sign = Sign.POSITIVE):
+        if any(index.offset != 0 for index in indices):
+            raise ValueError('summation indices cannot carry an offset')
+
+        super().__init__(sign)
+        self._set(body=body, indices=tuple(indices))
+
+    def __repr__(self):
+        names = ','.join(index.name for index in self.indices)
+        return f'{self.sign}Σ_{{{names}}}{self.body}'
+
+    def __neg__(self):
+        return IndexedSum(self.body, *self.indices, sign=-self.sign)
+
+    def copy(self):
+        return IndexedSum(self.body, *self.indices, sign=self.sign)
+
+    def expand(self) -> Expression:
+        if isinstance(self.body, Addition):
+            body_sign = self.sign * self.body.sign
+            return Addition(
+                IndexedSum(self.body.lhs.expand(), *self.indices, sign=body_sign),
+                IndexedSum(self.body.rhs.expand(), *self.indices, sign=body_sign)
+            )
+
+        return IndexedSum(self.body.expand(), *self.indices, sign=self.sign)
+
+    def simplify(self) -> Expression:
+        if is_zero(self.body):
+            return Integer.ZERO()
+
+        return IndexedSum(self.body.simplify(), *self.indices, sign=self.sign)
+
+    def unrolled(self, lattice: Lattice) -> Iterator[Expression]:
+        for index in self.indices:
+            if index.space not in lattice:
+                raise ValueError(f'no values given for index space {index.space}')
+
+        positions = _positions(lattice)
+        values = [lattice[index.space] for index in self.indices]
+
+        for assignment in cartesian(*values):
+            substitution = {
+                index.name: value
+                for index, value in zip(self.indices, assignment)
+            }
+            yield substitute(self.body, substitution, positions).mul_sign(self.sign)
+
+    def unroll(self, lattice: Lattice) -> Expression:
+        return balanced_summation(self.unrolled(lattice))
+
+    def normal_order(self) -> Expression:
+        # Shifted indices i+n and i+m with n != m are taken to be different
+        # sites. unroll() wraps shifts around periodically, so the result is
+        # only valid on lattices with more than |n-m| sites in that space.
+        result = []
+
+        for term in terms(expand(self.body)):
+            result.extend(_normal_order(term, self.indices))
+
+        return balanced_summation(result).mul_sign(self.sign)
+
+    def __hash__(self) -> int:
+        return hash((self.sign, self.body, self.indices))
+
+
+def unroll(expression: Expression, lattice: Lattice) -> Expression:
+    # balanced, an unrolled lattice sum is far too long for a chain
+    return balanced_summation(
+        summand
+        for term in terms(expression)
+        for summand in (
+            term.unrolled(lattice) if isinstance(term, IndexedSum)
+            else (substitute(term, {}, _positions(lattice)), )
+        )
+    )
+
+
+def substitute(
+        expression: Expression,
+        substitution: Dict[str, Component],
+        positions: Optional[Dict[str, Tuple[Sequence[Hashable], Dict[Hashable, int]]]] = None
+    ) -> Expression:
+    if isinstance(expression, IndexedSymbol):
+        indices = [
+            _resolve(index, substitution, positions)
+            for index in expression.indices
+        ]
+
+        if any(isinstance(index, Index) for index in indices):
+            return IndexedSymbol(*indices, sign=expression.sign)
+        return Symbol('_'.join(str(index) for index in indices), expression.sign)
+    elif isinstance(expression, KroneckerDelta):
+        lhs = substitute(expression.lhs, substitution, positions)
+        rhs = substitute(expression.rhs, substitution, positions)
+
+        if isinstance(lhs, IndexedSymbol) or isinstance(rhs, IndexedSymbol):
+            return KroneckerDelta(lhs, rhs, expression.sign)
+        return Integer(1 if lhs == rhs else 0, expression.sign)
+    elif isinstance(expression, IndexedSum):
+        inner = {
+            name: value for name, value in substitution.items()
+            if all(index.name != name for index in expression.indices)
+        }
+        return IndexedSum(
+            substitute(expression.body, inner, positions),
+            *expression.indices,
+            sign=expression.sign
+        )
+    elif isinstance(expression, Addition):
+        return Addition(
+            substitute(expression.lhs, substitution, positions),
+            substitute(expression.rhs, substitution, positions),
+            expression.sign
+        )
+    elif isinstance(expression, Multiplication):
+        return Multiplication(
+            substitute(expression.lhs, substitution, positions),
+            substitute(expression.rhs, substitution, positions),
+            expression.sign
+        )
+    elif isinstance(expression, (FermionCreation, FermionAnnihilation)):
+        return type(expression)(
+            substitute(expression.state, substitution, positions),
+            expression.sign
+        )
+    elif isinstance(expression, (FermionKet, FermionBra)):
+        return type(expression)(
+            *[substitute(state, substitution, positions) for state in expression.state],
+            sign=expression.sign
+        )
+
+    return expression.copy()
+
+
+def _positions(lattice: Lattice) -> Dict[str, Tuple[Sequence[Hashable], Dict[Hashable, int]]]:
+    return {
+        space: (values, {value: position for position, value in enumerate(values)})
+        for space, values in lattice.items()
+    }
+
+
+def _resolve(index: Component, substitution: Dict[str, Component], positions) -> Component:
+    if not isinstance(index, Index) or index.name not in substitution:
+        return index
+
+    target = substitution[index.name]
+
+    if isinstance(target, Index):
+        return target + index.offset
+    if index.offset == 0:
+        return target
+    if positions is None or index.space not in positions:
+        raise ValueError(f'shifted index {index} needs the lattice of {index.space}')
+
+    # Shifted indices wrap around, i.e. the lattice is periodic.
+    values, position = positions[index.space]
+    return values[(position[target] + index.offset) % len(values)]
+
+
+def _unify(lhs: Symbol, rhs: Symbol, bound: Tuple[Index, ...]) -> Union[None, bool, Dict[str, Component]]:
+    # Decides δ(lhs, rhs): True/False if it is known, a substitution of
+    # summation indices that makes both sides equal, or None if undecidable.
+    substitution = {}
+
+    while True:
+        step = _unify_step(lhs, rhs, bound)
+
+        if not isinstance(step, dict):
+            return substitution if step is True and len(substitution) > 0 else step
+        if _shifts_to_value([lhs, rhs, *substitution.values()], step):
+            return None
+
+        substitution = {
+            name: _resolve(value, step, None)
+            for name, value in substitution.items()
+        }
+        substitution.update(step)
+
+        lhs = substitute(lhs, step)
+        rhs = substitute(rhs, step)
+        bound = tuple(index for index in bound if index.name not in step)
+
+
+def _shifts_to_value(expressions: List[Union[Expression, Component]], substitution: Dict[str, Component]) -> bool:
+    # A shifted index set to a value can only be resolved on the lattice, so
+    # such a contraction is kept as an explicit KroneckerDelta instead.
+    return any(
+        isinstance(index, Index)
+        and index.offset != 0
+        and index.name in substitution
+        and not isinstance(substitution[index.name], Index)
+        for expression in expressions
+        for index in _components(expression)
+    )
+
+
+def _components(expression: Union[Expression, Component]) -> Iterator[Component]:
+    if isinstance(expression, IndexedSymbol):
+        yield from expression.indices
+    elif isinstance(expression, KroneckerDelta):
+        yield from _components(expression.lhs)
+        yield from _components(expression.rhs)
+    elif isinstance(expression, (FermionCreation, FermionAnnihilation)):
+        yield from _components(expression.state)
+    elif isinstance(expression, Index):
+        yield expression
+
+
+def _unify_step(lhs: Symbol, rhs: Symbol, bound: Tuple[Index, ...]) -> Union[None, bool, Dict[str, Component]]:
+    if lhs == rhs:
+        return True
+    if not isinstance(lhs, IndexedSymbol) and not isinstance(rhs, IndexedSymbol):
+        return False
+    if not isinstance(lhs, IndexedSymbol) or not isinstance(rhs, IndexedSymbol):
+        return None
+    if len(lhs.indices) != len(rhs.indices):
+        return False
+
+    bound_names = [index.name for index in bound]
+
+    for x, y in zip(lhs.indices, rhs.indices):
+        if x == y:
+            continue
+
+        x_bound = isinstance(x, Index) and x.name in bound_names
+        y_bound = isinstance(y, Index) and y.name in bound_names
+
+        if isinstance(x, Index) and isinstance(y, Index) and x.name == y.name:
+            # i+n and i+m with n != m never coincide on a lattice longer than
+            # |n-m|, which normal_order() assumes
+            return False
+        if x_bound and (isinstance(y, Index) or x.offset == 0):
+            return {x.name: y - x.offset if isinstance(y, Index) else y}
+        if y_bound and (isinstance(x, Index) or y.offset == 0):
+            return {y.name: x - y.offset if isinstance(x, Index) else x}
+        if not isinstance(x, Index) and not isinstance(y, Index):
+            return False
+
+        return None
+
+    return True
+
+
+def _normal_order(term: Expression, bound: Tuple[Index, ...]) -> List[Expression]:
+    term_factors, sign = factors(term)
+
+    scalars = [f for f in term_factors if not isinstance(f, (FermionCreation, FermionAnnihilation))]
+    operators = [f for f in term_factors if isinstance(f, (FermionCreation, FermionAnnihilation))]
+
+    if any(not isinstance(f, (Symbol, Integer, KroneckerDelta)) for f in scalars):
+        return [IndexedSum(term, *bound)]
+
+    result = []
+    pending = [(sign, scalars, operators, bound)]
+
+    while len(pending) > 0:
+        sign, scalars, operators, bound = pending.pop()
+
+        position = next((
+            i for i in range(len(operators) - 1)
+            if isinstance(operators[i], FermionAnnihilation)
+            and isinstance(operators[i + 1], FermionCreation)
+        ), None)
+
+        if position is None:
+            if any(
+                type(lhs) == type(rhs) and lhs.state == rhs.state
+                for lhs, rhs in zip(operators, operators[1:])
+            ):
+                continue
+
+            body = product(scalars + operators).mul_sign(sign)
+            result.append(IndexedSum(body, *bound) if len(bound) > 0 else body)
+            continue
+
+        annihilation, creation = operators[position], operators[position + 1]
+        swapped = operators[:position] + [creation, annihilation] + operators[position + 2:]
+        pending.append((-sign, scalars, swapped, bound))
+
+        remaining = operators[:position] + operators[position + 2:]
+        contraction = _unify(annihilation.state, creation.state, bound)
+
+        if isinstance(contraction, dict) and _shifts_to_value(scalars + remaining, contraction):
+            contraction = None
+
+        if contraction is True:
+            pending.append((sign, scalars, remaining, bound))
+        elif contraction is None:
+            delta = KroneckerDelta(annihilation.state, creation.state)
+            pending.append((sign, scalars + [delta], remaining, bound))
+        elif isinstance(contraction, dict):
+            pending.append((
+                sign,
+                [substitute(f, contraction) for f in scalars],
+                [substitute(f, contraction) for f in remaining],
+                tuple(index for index in bound if index.name not in contraction)
+            ))
+
+    return result
@@ -0,0 +1,160 @@
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Sequence, Tuple, Union
+
+from .quant import Expression, Symbol, Integer, Addition, Sign, Fd, F, factors, product, balanced_summation, is_zero
+
+SPINS = ('up', 'down')
+
+Bond = Tuple[int, int]
+Coefficient = Union[Expression, int]
+
+
+@dataclass(frozen=True)
+class Lattice:
+    n_sites: int
+    bonds: Tuple[Bond, ...]
+
+
+def chain(n_sites: int, periodic: bool = True) -> Lattice:
+    bonds = [(site, site + 1) for site in range(n_sites - 1)]
+
+    # two sites are already connected by the open bond
+    if periodic and n_sites > 2:
+        bonds.append((n_sites - 1, 0))
+
+    return Lattice(n_sites, tuple(bonds))
+
+
+def square(width: int, height: int, periodic: bool = True) -> Lattice:
+    bonds = []
+
+    for y in range(height):
+        for x in range(width):
+            site = y * width + x
+            if x + 1 < width or (periodic and width > 2):
+                bonds.append((site, y * width + (x + 1) % width))
+            if y + 1 < height or (periodic and height > 2):
+                bonds.append((site, ((y + 1) % height) * width + x))
+
+    return Lattice(width * height, tuple(bonds))
+
+
+def orbital(site: int, spin: str) -> Symbol:
+    return Symbol(f'{site}_{spin}')
+
+
+def orbitals(lattice: Union[Lattice, Sequence[Bond]]) -> List[Symbol]:
+    # site-major, the order TranslationBasis expects
+    lattice = _lattice(lattice)
+    return [orbital(site, spin) for site in range(lattice.n_sites) for spin in SPINS]
+
+
+def hubbard(lattice: Union[Lattice, Sequence[Bond]], t: Coefficient, U: Coefficient) -> Expression:
+    # H = -t Σ_<ij>σ (c†_iσ c_jσ + c†_jσ c_iσ) + U Σ_i n_i↑ n_i↓
+    lattice = _lattice(lattice)
+    t, U = factors(_coefficient(t)), factors(_coefficient(U))
+    creators, annihilators = _operators(lattice)
+
+    hopping = (
+        _term(t, creators[a, spin], annihilators[b, spin])
+        for i, j in lattice.bonds
+        for spin in SPINS
+        for a, b in ((i, j), (j, i))
+    )
+    interaction = (
+        _term(U, creators[site, 'up'], annihilators[site, 'up'], creators[site, 'down'], annihilators[site, 'down'])
+        for site in range(lattice.n_sites)
+    )
+
+    return _combine([interaction], [hopping])
+
+
+def heisenberg(lattice: Union[Lattice, Sequence[Bond]], J: Coefficient) -> Expression:
+    # H = J Σ_<ij> σ_i·σ_j in terms of Pauli matrices, that is 4J Σ S_i·S_j,
+    # so that every coefficient stays an Integer:
+    # σ_i·σ_j = 2 (σ+_i σ-_j + σ-_i σ+_j) + σz_i σz_j with σ+ = c†↑ c↓ and σz = n↑ - n↓
+    lattice = _lattice(lattice)
+    J = _coefficient(J)
+    two = factors(_multiply(Integer(2), J))
+    J = factors(J)
+    creators, annihilators = _operators(lattice)
+
+    def number(site: int, spin: str) -> Tuple[Expression, Expression]:
+        return creators[site, spin], annihilators[site, spin]
+
+    flips = (
+        _term(two, creators[i, a], annihilators[i, b], creators[j, b], annihilators[j, a])
+        for i, j in lattice.bonds
+        for a, b in (('up', 'down'), ('down', 'up'))
+    )
+    parallel = (
+        _term(J, *number(i, spin), *number(j, spin))
+        for i, j in lattice.bonds
+        for spin in SPINS
+    )
+    antiparallel = (
+        _term(J, *number(i, spin), *number(j, other))
+        for i, j in lattice.bonds
+        for spin, other in (('up', 'down'), ('down', 'up'))
+    )
+
+    return _combine([flips, parallel], [antiparallel])
+
+
+def _operators(lattice: Lattice) -> Tuple[Dict[Tuple[int, str], Expression], Dict[Tuple[int, str], Expression]]:
+    # nodes are immutable, so every term can share the same operator objects
+    creators, annihilators = {}, {}
+
+    for site in range(lattice.n_sites):
+        for spin in SPINS:
+            creators[site, spin] = Fd(orbital(site, spin))
+            annihilators[site, spin] = F(orbital(site, spin))
+
+    return creators, annihilators
+
+
+def _combine(positive: List[Iterable[Expression]], negative: List[Iterable[Expression]]) -> Expression:
+    # Summands of one sign are collected in their own balanced tree, an
+    # Addition of two negative summands would have to copy both of them.
+    positive = balanced_summation(term for terms in positive for term in terms)
+    negative = balanced_summation(term for terms in negative for term in terms)
+
+    if is_zero(negative):
+        return positive
+    elif is_zero(positive):
+        return -negative
+    return Addition(positive, -negative)
+
+
+def _lattice(lattice: Union[Lattice, Sequence[Bond]]) -> Lattice:
+    if isinstance(lattice, Lattice):
+        return lattice
+
+    bonds = tuple((i, j) for i, j in lattice)
+    n_sites = 1 + max((site for bond in bonds for site in bond), default=-1)
+    return Lattice(n_sites, bonds)
+
+
+def _coefficient(coefficient: Coefficient) -> Expression:
+    if isinstance(coefficient, Expression):
+        return coefficient
+    elif isinstance(coefficient, int):
+        return Integer.from_number(coefficient)
+
+    raise TypeError(f'{coefficient} is neither an Expression nor an int')
+
+
+def _multiply(lhs: Expression, rhs: Expression) -> Expression:
+    if isinstance(lhs, Integer) and isinstance(rhs, Integer):
+        number = lhs.sign.number() * lhs.number * rhs.sign.number() * rhs.number
+        return Integer.from_number(number)
+
+    return product([lhs, rhs])
+
+
+def _term(coefficient: Tuple[List[Expression], Sign], *operators: Expression) -> Expression:
+    # Built right-nested with the scalars in front, the form expand() leaves
+    # products in, so that expanding the Hamiltonian does no work.
+    scalars, sign = coefficient
+    term = product(scalars + list(operators))
+    return term if sign == Sign.POSITIVE else term.mul_sign(sign)
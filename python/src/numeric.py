@@ -0,0 +1,120 @@
+from numbers import Number
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+from .quant import (
+    Sign,
+    Expression,
+    Symbol,
+    Integer,
+    Addition,
+    FermionKet,
+    FermionCreation,
+    FermionAnnihilation,
+    expanded_terms,
+    factors,
+    terms,
+)
+
+# An operator string is a tuple of (orbital index, is creation) pairs in
+# the order they are written, i.e. the rightmost one acts first.
+OperatorString = Tuple[Tuple[int, bool], ...]
+Values = Dict[Symbol, Number]
+
+
+def monomials(expression: Expression) -> Iterator[Tuple[List[Expression], Sign]]:
+    # Most summands are already products of atoms, only the others are
+    # distributed with expanded_terms().
+    for term in terms(expression):
+        term_factors, sign = factors(term)
+
+        if any(isinstance(factor, Addition) for factor in term_factors):
+            for expanded in expanded_terms(term):
+                yield factors(expanded)
+        else:
+            yield term_factors, sign
+
+
+def orbitals(expression: Expression) -> List[Symbol]:
+    found = set()
+
+    for term_factors, _ in monomials(expression):
+        for factor in term_factors:
+            if isinstance(factor, (FermionCreation, FermionAnnihilation)):
+                found.add(factor.state)
+            elif isinstance(factor, FermionKet):
+                found.update(factor.state)
+
+    return sorted(found)
+
+
+def operator_terms(
+        expression: Expression,
+        orbital_order: Sequence[Symbol],
+        values: Optional[Values] = None
+    ) -> Iterator[Tuple[Number, OperatorString]]:
+    index = {orbital: i for i, orbital in enumerate(orbital_order)}
+    values = {} if values is None else values
+
+    for term_factors, sign in monomials(expression):
+        coefficient = sign.number()
+        operators = []
+
+        for factor in term_factors:
+            if isinstance(factor, Integer):
+                coefficient *= factor.number
+            elif isinstance(factor, Symbol):
+                if factor not in values:
+                    raise ValueError(f'no value given for symbol {factor}')
+                coefficient *= values[factor]
+            elif isinstance(factor, (FermionCreation, FermionAnnihilation)):
+                if factor.state not in index:
+                    raise ValueError(f'orbital {factor.state} is not in the orbital order')
+                operators.append((index[factor.state], isinstance(factor, FermionCreation)))
+            else:
+                raise TypeError(f'{factor} is neither a number, a symbol nor a fermion operator')
+
+        if coefficient != 0:
+            yield coefficient, tuple(operators)
+
+
+def apply(mask: int, operators: OperatorString) -> Tuple[int, int]:
+    # Returns the new occupation mask and the sign, a sign of 0 means the
+    # string annihilates the determinant.
+    sign = 1
+
+    for index, create in reversed(operators):
+        bit = 1 << index
+
+        if bool(mask & bit) == create:
+            return 0, 0
+        if (mask & (bit - 1)).bit_count() % 2 != 0:
+            sign = -sign
+
+        mask ^= bit
+
+    return mask, sign
+
+
+def to_mask(ket: FermionKet, orbital_order: Union[Sequence[Symbol], Dict[Symbol, int]]) -> Tuple[int, int]:
+    index = orbital_order if isinstance(orbital_order, dict) else {
+        orbital: i for i, orbital in enumerate(orbital_order)
+    }
+    positions = [index[state] for state in ket.state]
+
+    # The ket is ordered by name, the mask by position in orbital_order.
+    inversions = sum(
+        1 for i in range(len(positions)) for j in range(i + 1, len(positions))
+        if positions[i] > positions[j]
+    )
+
+    mask = 0
+    for position in positions:
+        mask |= 1 << position
+    return mask, ket.sign.number() * (-1 if inversions % 2 != 0 else 1)
+
+
+def to_ket(mask: int, orbital_order: Sequence[Symbol]) -> FermionKet:
+    return FermionKet(*[
+        orbital for i, orbital in enumerate(orbital_order)
+        if mask >> i & 1
+    ])
@@ -0,0 +1,149 @@
+import os
+import sys
+from dataclasses import dataclass
+from enum import Enum
+from typing import Optional, Union
+
+from .quant import Expression, Symbol, Addition, Multiplication, expand, simplify, expanded_terms
+from .driver import normalize, run, run_threaded
+from .accumulator import Accumulator
+
+IN_MEMORY_TERMS = 256
+PARALLEL_TERMS = 10000
+
+
+class Strategy(Enum):
+    IN_MEMORY = "in-memory"
+    STREAMING = "streaming"
+    PARALLEL = "parallel"
+
+    def __repr__(self):
+        return self.value
+
+    def __str__(self):
+        return self.value
+
+
+@dataclass(frozen=True)
+class Plan:
+    terms: int
+    nodes: int
+    bytes: int
+    memory_limit: int
+    strategy: Strategy
+
+    @property
+    def fits(self) -> bool:
+        return self.bytes <= self.memory_limit
+
+
+def plan(
+        expression: Expression,
+        memory_limit: Optional[int] = None,
+        workers: Optional[int] = None
+    ) -> Plan:
+    memory_limit = _default_memory_limit() if memory_limit is None else memory_limit
+    workers = (os.cpu_count() or 1) if workers is None else workers
+
+    terms, leaves = _estimate(expression)
+
+    # Every expanded term with k factors needs k - 1 products, and the terms
+    # are joined by terms - 1 additions. Leaves are counted as if they were
+    # not shared, so this is an upper bound.
+    nodes = 2 * leaves - 1
+    size = nodes * _node_bytes()
+
+    # expand() and simplify() recurse along the addition chain, so only small
+    # results are built in one piece.
+    if terms <= IN_MEMORY_TERMS and size <= memory_limit:
+        strategy = Strategy.IN_MEMORY
+    elif terms >= PARALLEL_TERMS and workers > 1:
+        strategy = Strategy.PARALLEL
+    else:
+        strategy = Strategy.STREAMING
+
+    return Plan(terms, nodes, size, memory_limit, strategy)
+
+
+def execute(
+        expression: Expression,
+        dry_run: bool = False,
+        memory_limit: Optional[int] = None,
+        workers: Optional[int] = None,
+        max_terms: Optional[int] = None,
+        output: Optional[Accumulator] = None,
+        force: bool = False
+    ) -> Union[Plan, Expression, Accumulator]:
+    result = plan(expression, memory_limit, workers)
+
+    if dry_run:
+        return result
+
+    if max_terms is not None and result.terms > max_terms:
+        raise ValueError(f'the expansion has up to {result.terms} terms, more than the limit of {max_terms}')
+
+    # Only an accumulator spills to disk, every other strategy keeps all the
+    # results in memory until they are summed up.
+    if output is not None:
+        for term in expanded_terms(expression):
+            output.add(normalize(term))
+        return output
+
+    if not result.fits and not force:
+        raise ValueError(
+            f'the expansion needs up to {result.bytes} bytes, more than the limit of {result.memory_limit}, '
+            'pass an Accumulator as output to stream it or force=True to run it anyway'
+        )
+
+    if result.strategy == Strategy.IN_MEMORY:
+        return simplify(expand(expression))
+    elif result.strategy == Strategy.PARALLEL:
+        return run_threaded(expression, workers=workers)
+
+    return run(expression)
+
+
+def _estimate(expression: Expression):
+    # (number of expanded terms, number of factors summed over those terms)
+    estimates = {}
+    stack = [expression]
+
+    while len(stack) > 0:
+        node = stack[-1]
+
+        if isinstance(node, (Addition, Multiplication)):
+            missing = [c for c in (node.lhs, node.rhs) if id(c) not in estimates]
+            if len(missing) > 0:
+                stack.extend(missing)
+                continue
+
+            lhs_terms, lhs_leaves = estimates[id(node.lhs)]
+            rhs_terms, rhs_leaves = estimates[id(node.rhs)]
+
+            if isinstance(node, Addition):
+                estimates[id(node)] = (lhs_terms + rhs_terms, lhs_leaves + rhs_leaves)
+            else:
+                estimates[id(node)] = (
+                    lhs_terms * rhs_terms,
+                    lhs_leaves * rhs_terms + rhs_leaves * lhs_terms
+                )
+        else:
+            estimates[id(node)] = (1, 1)
+
+        stack.pop()
+
+    return estimates[id(expression)]
+
+
+def _node_bytes() -> int:
+    node = Multiplication(Symbol('a'), Symbol('b'))
+    return sys.getsizeof(node) + sys.getsizeof(node.__dict__)
+
+
+def _default_memory_limit() -> int:
+    try:
+        physical = os.sysconf('SC_PHYS_PAGES') * os.sysconf('SC_PAGE_SIZE')
+    except (AttributeError, ValueError, OSError):
+        return 1 << 30
+
+    return physical // 4
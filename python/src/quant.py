@@ -1,35 +1,135 @@
 from abc import ABC
+from bisect import bisect_left
 from dataclasses import dataclass
-from typing import List, Union, Dict, Tuple
-from enum import Enum
-
-class Sign(Enum):
-    POSITIVE = ""
-    NEGATIVE = "-"
+from typing import List, Union, Dict, Tuple, Iterable, Iterator, Optional
+from numbers import Number
+from types import MappingProxyType
+
+from .rules import RuleRegistry
+
+class _SignType(type):
+    # iteration over the members, as the Enum this class replaces allowed
+    def __iter__(cls) -> Iterator['Sign']:
+        return iter(_PHASES)
+
+    def __len__(cls) -> int:
+        return len(_PHASES)
+
+
+class Sign(int, metaclass=_SignType):
+    # The phase i^k is packed into k in Z4: multiplying two phases adds their
+    # exponents mod 4. The four instances are created once and looked up,
+    # never built per operation. A Sign is an int only to be cheap: it is
+    # always true, only equal to itself, and multiplying it with a number
+    # multiplies by the phase. Other int arithmetic is not part of its API.
+    # Of the Enum API, iteration, value lookup, name and value are kept.
+    __slots__ = ()
+
+    POSITIVE: 'Sign'
+    IMAGINARY: 'Sign'
+    NEGATIVE: 'Sign'
+    NEGATIVE_IMAGINARY: 'Sign'
+
+    def __new__(cls, exponent: Union[int, str] = 0) -> 'Sign':
+        if isinstance(exponent, str):
+            if exponent not in _SYMBOLS:
+                raise ValueError(f'{exponent!r} is not a valid Sign')
+            return _PHASES[_SYMBOLS.index(exponent)]
+        return _PHASES[exponent & 3]
 
     def __repr__(self):
-        return self.value
-    
+        return _SYMBOLS[self]
+
     def __str__(self):
-        return self.value
+        return _SYMBOLS[self]
+
+    @property
+    def value(self) -> str:
+        return _SYMBOLS[self]
+
+    @property
+    def name(self) -> str:
+        return _NAMES[self]
+
+    def __bool__(self) -> bool:
+        return True
+
+    def __eq__(self, other) -> bool:
+        return self is other
 
-    def __mul__(self, rhs: 'Sign') -> 'Sign':
-        return Sign.POSITIVE if self == rhs else Sign.NEGATIVE
+    def __ne__(self, other) -> bool:
+        return self is not other
+
+    __hash__ = int.__hash__
+
+    def __mul__(self, rhs):
+        if type(rhs) is Sign:
+            return _PHASES[(self + rhs) & 3]
+        elif isinstance(rhs, Number):
+            return _NUMBERS[self] * rhs
+        return NotImplemented
+
+    __rmul__ = __mul__
 
     def __neg__(self) -> 'Sign':
-        return Sign.NEGATIVE if self == Sign.POSITIVE else Sign.POSITIVE
-    
-    def number(self) -> int:
-        return 1 if self == Sign.POSITIVE else -1
-    
+        return _PHASES[(self + 2) & 3]
+
+    def __reduce__(self):
+        return Sign, (int(self),)
+
+    def conjugate(self) -> 'Sign':
+        return _PHASES[(4 - self) & 3]
+
+    def is_negative(self) -> bool:
+        return self & 2 != 0
+
+    def number(self) -> Union[int, complex]:
+        return _NUMBERS[self]
+
+    @classmethod
+    def from_parity(cls, parity: int) -> 'Sign':
+        return _PHASES[(parity & 1) << 1]
+
     @classmethod
     def from_number(cls, number) -> 'Sign':
-        return Sign.POSITIVE if number >= 0 else Sign.NEGATIVE
+        if number.imag == 0:
+            return Sign.POSITIVE if number.real >= 0 else Sign.NEGATIVE
+        elif number.real == 0:
+            return Sign.IMAGINARY if number.imag > 0 else Sign.NEGATIVE_IMAGINARY
+
+        raise ValueError(f'{number} is not a multiple of a single phase')
 
-@dataclass(frozen=True)
+_PHASES = tuple(int.__new__(Sign, exponent) for exponent in range(4))
+_SYMBOLS = ('', 'i⋅', '-', '-i⋅')
+_NUMBERS = (1, 1j, -1, -1j)
+_NAMES = ('POSITIVE', 'IMAGINARY', 'NEGATIVE', 'NEGATIVE_IMAGINARY')
+
+Sign.POSITIVE, Sign.IMAGINARY, Sign.NEGATIVE, Sign.NEGATIVE_IMAGINARY = _PHASES
+
+DISPLAY_LIMIT = 5
+
+SIMPLIFY_RULES = RuleRegistry('simplify')
+EXPAND_RULES = RuleRegistry('expand')
+
+@dataclass
 class Expression(ABC):
     sign: Sign = Sign.POSITIVE
 
+    def __init__(self, sign: Sign = Sign.POSITIVE):
+        self._set(sign=sign)
+
+    def _set(self, **attributes):
+        # Nodes are shared between expressions and threads, so attributes
+        # are only ever written while a node is being constructed.
+        for name, value in attributes.items():
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f'{type(self).__name__} is immutable')
+
+    def __delattr__(self, name):
+        raise AttributeError(f'{type(self).__name__} is immutable')
+
     def __add__(self, other: 'Expression') -> 'Addition':
         return Addition(self, other)
     
@@ -41,7 +141,7 @@ class Expression(ABC):
 
     def mul_sign(self, sign: Sign) -> 'Expression':
         this = self.copy()
-        this.sign *= sign 
+        this._set(sign=this.sign * sign)
         return this
 
     def __neg__(self) -> 'Expression':
@@ -51,18 +151,44 @@ class Expression(ABC):
         raise NotImplementedError('copy was not implemented for this class')
 
     def expand(self) -> 'Expression':
-        return self
+        result = EXPAND_RULES.apply(self)
+        return self if result is None else result
 
     def simplify(self) -> 'Expression':
-       return self
+        result = SIMPLIFY_RULES.apply(self)
+        return self if result is None else result
     
     def __hash__(self) -> int:
         return hash(self.sign)
 
-@dataclass(frozen=True)
+    def _repr_html_(self) -> str:
+        from .writer import repr_html
+        return repr_html(self, DISPLAY_LIMIT)
+
+    def _repr_latex_(self) -> str:
+        from .writer import repr_latex
+        return repr_latex(self, DISPLAY_LIMIT)
+
+    def _repr_pretty_(self, printer, cycle: bool):
+        # IPython renders text/plain next to html and latex, through
+        # __repr__ unless told otherwise, which recurses over every node
+        from .writer import summary
+        printer.text(summary(self, DISPLAY_LIMIT))
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # IPython stops at the first class in the mro that defines __repr__
+        if '_repr_pretty_' not in cls.__dict__:
+            cls._repr_pretty_ = Expression._repr_pretty_
+
+@dataclass(init=False)
 class Symbol(Expression):
     name: str
 
+    def __init__(self, name: str, sign: Sign = Sign.POSITIVE):
+        super().__init__(sign)
+        self._set(name=name)
+
     def __repr__(self):
         return f'{self.sign}{self.name}'
     
@@ -85,10 +211,14 @@ class Symbol(Expression):
     def copy(self):
         return Symbol(self.name, self.sign)
 
-@dataclass(frozen=True)
+@dataclass(init=False)
 class Integer(Expression):
     number: int
 
+    def __init__(self, number: int, sign: Sign = Sign.POSITIVE):
+        super().__init__(sign)
+        self._set(number=number)
+
     def __repr__(self):
         return f'{self.sign}{self.number}'
     
@@ -101,12 +231,18 @@ class Integer(Expression):
     def copy(self):
         return Integer(self.number, self.sign)
     
-    def add(self, other: 'Integer'):
+    def add(self, other: 'Integer') -> Expression:
         a = self.sign.number() * self.number
         b = other.sign.number() * other.number
 
         r = a + b
-        return Integer(abs(r), Sign.from_number(r))
+        if r.real != 0 and r.imag != 0:
+            return Addition(self, other)
+        return Integer.from_number(r)
+
+    @classmethod
+    def from_number(cls, number) -> 'Integer':
+        return Integer(abs(int(number.real)) + abs(int(number.imag)), Sign.from_number(number))
     
     @classmethod
     def ZERO(cls):
@@ -119,26 +255,26 @@ class Integer(Expression):
     def __hash__(self) -> int:
         return hash((self.number, self.sign))
 
-@dataclass(frozen=True, init=False)
+@dataclass(init=False)
 class Addition(Expression):
     lhs: Expression
     rhs: Expression
     
     def __init__(self, lhs: Expression, rhs: Expression, sign: Sign = Sign.POSITIVE):
-        super().__init__(sign)
-        self.lhs = lhs
-        self.rhs = rhs
+        if lhs.sign == rhs.sign and lhs.sign != Sign.POSITIVE:
+            common = lhs.sign
+            sign = sign * common
+            lhs = lhs.mul_sign(common.conjugate())
+            rhs = rhs.mul_sign(common.conjugate())
 
-        if lhs.sign == Sign.NEGATIVE and rhs.sign == Sign.NEGATIVE:
-            super().__init__(sign * Sign.NEGATIVE)
-            self.lhs.sign = Sign.POSITIVE
-            self.rhs.sign = Sign.POSITIVE
+        super().__init__(sign)
+        self._set(lhs=lhs, rhs=rhs)
 
     def __neg__(self):
         return Addition(self.lhs, self.rhs, -self.sign)
 
     def __repr__(self):
-        if self.rhs.sign == Sign.NEGATIVE:
+        if self.rhs.sign.is_negative():
             return f'{self.sign}({self.lhs} - {-self.rhs})'
         return f'{self.sign}({self.lhs} + {self.rhs})'
     
@@ -146,33 +282,43 @@ class Addition(Expression):
         return Addition(self.lhs, self.rhs, self.sign)
     
     def simplify(self) -> Expression:
-         if isinstance(self.lhs, Integer) and isinstance(self.rhs, Integer):
-             return self.lhs.add(self.rhs).mul_sign(self.sign)
-         elif isinstance(self.lhs, Integer) and self.lhs == Integer(0):
-             return self.rhs.mul_sign(self.sign)
-         elif isinstance(self.rhs, Integer) and self.rhs == Integer(0):
-             return self.lhs.mul_sign(self.sign)
-         
-         return Addition(self.lhs.simplify(), self.rhs.simplify(), self.sign)
+        result = SIMPLIFY_RULES.apply(self)
+        if result is not None:
+            return result
+
+        return Addition(self.lhs.simplify(), self.rhs.simplify(), self.sign)
          
     def expand(self) -> Expression:
+        result = EXPAND_RULES.apply(self)
+        if result is not None:
+            return result
+
         return Addition(self.lhs.expand(), self.rhs.expand(), self.sign)
 
     def __hash__(self) -> int:
         return hash((self.lhs, self.rhs, self.sign))
 
-@dataclass(frozen=True)
+@dataclass
 class Multiplication(Expression):
     def __init__(self, lhs: Expression, rhs: Expression, sign: Sign = Sign.POSITIVE):
         super().__init__(sign * lhs.sign * rhs.sign)
-        self.lhs = lhs
-        self.rhs = rhs
-
-        if self.__should_be_swapped(self.lhs, self.rhs):
-            self.lhs, self.rhs = self.rhs, self.lhs
 
-        self.lhs.sign = Sign.POSITIVE
-        self.rhs.sign = Sign.POSITIVE
+        if lhs.sign != Sign.POSITIVE:
+            lhs = lhs.mul_sign(lhs.sign.conjugate())
+        if rhs.sign != Sign.POSITIVE:
+            rhs = rhs.mul_sign(rhs.sign.conjugate())
+
+        if self.__should_be_swapped(lhs, rhs):
+            lhs, rhs = rhs, lhs
+
+        # The outermost factors of the chain, kept so that rules can look at
+        # the ends of a product without walking down to them.
+        self._set(
+            lhs=lhs,
+            rhs=rhs,
+            first=lhs.first if isinstance(lhs, Multiplication) else lhs,
+            last=rhs.last if isinstance(rhs, Multiplication) else rhs
+        )
 
     def __should_be_swapped(self, lhs: Expression, rhs: Expression):
         return (
@@ -191,67 +337,33 @@ class Multiplication(Expression):
         return Multiplication(self.lhs, self.rhs, self.sign)
     
     def expand(self):
-        if isinstance(self.lhs, Addition):
-            rhs = self.rhs.copy().expand()
-            return Addition(
-                Multiplication(self.lhs.lhs.expand(), rhs, self.sign),
-                Multiplication(self.lhs.rhs.expand(), rhs, self.sign)
-            )
-        elif isinstance(self.rhs, Addition):
-            lhs = self.lhs.copy().expand()
-            return Addition(
-                Multiplication(lhs, self.rhs.lhs.expand(), self.sign),
-                Multiplication(lhs, self.rhs.rhs.expand(), self.sign)
-            )
-        elif isinstance(self.lhs, Multiplication):
-            return Multiplication(
-                self.lhs.lhs.expand(), 
-                Multiplication(self.lhs.rhs.expand(), self.rhs.expand(), self.lhs.sign), 
-                self.sign)
-        elif (isinstance(self.rhs, Multiplication) and isinstance(self.rhs.lhs, (Symbol, Integer)) and not isinstance(self.lhs, (Symbol, Integer))):
-            return Multiplication(
-                self.rhs.lhs,
-                Multiplication(self.lhs.expand(), self.rhs.rhs.expand(), self.rhs.sign),
-                self.sign)
-        elif (isinstance(self.rhs, Multiplication) and isinstance(self.rhs.lhs, Integer) and isinstance(self.lhs, Symbol)):
-            return Multiplication(
-                self.rhs.lhs,
-                Multiplication(self.lhs, self.rhs.rhs.expand(), self.rhs.sign),
-                self.sign
-            )
-        
+        result = EXPAND_RULES.apply(self)
+        if result is not None:
+            return result
+
         return Multiplication(self.lhs.expand(), self.rhs.expand(), self.sign)
     
     def simplify(self) -> Expression:
-        if isinstance(self.rhs, Ket) and isinstance(self.lhs, Operator):
-            return self.lhs.apply(self.rhs).mul_sign(self.sign)
-        elif ((isinstance(self.rhs, Integer) and self.rhs == Integer(0))
-            or (isinstance(self.lhs, Integer) and self.lhs == Integer(0))
-            ):
-            return Integer(0)
-        elif (isinstance(self.rhs, Integer) and self.rhs == Integer(1)):
-            return self.lhs.mul_sign(self.sign)
-        elif (isinstance(self.lhs, Integer) and self.lhs == Integer(1)):
-            return self.rhs.mul_sign(self.sign)
-        elif isinstance(self.lhs, Bra) and isinstance(self.rhs, Ket):
-            return self.lhs.inner(self.rhs).mul_sign(self.sign)
-        
+        result = SIMPLIFY_RULES.apply(self)
+        if result is not None:
+            return result
+
         return Multiplication(self.lhs.simplify(), self.rhs.simplify(), self.sign)
 
     def __hash__(self) -> int:
         return hash((self.lhs, self.rhs, self.sign))
 
-@dataclass(frozen=True)
+@dataclass
 class Ket(Expression):
     def __init__(self, state: Union[None, Tuple[Symbol], List[Symbol], Dict[Symbol, int]] = None, sign=Sign.POSITIVE):
         super().__init__(sign)
 
         if isinstance(state,dict):
-            self.state = {k:v for k, v in state.items()}
+            self._set(state=MappingProxyType({k:v for k, v in state.items()}))
         elif isinstance(state, list) or isinstance(state, tuple):
-            self.state = {k:1 for k in state}
+            self._set(state=MappingProxyType({k:1 for k in state}))
         elif state == None:
-            self.state = {}
+            self._set(state=MappingProxyType({}))
         
     def __neg__(self):
         raise NotImplementedError('unary negative was not implemented for Ket') 
@@ -272,20 +384,24 @@ class Ket(Expression):
     def annihilate(self, state: Symbol) -> 'Ket':
         raise NotImplementedError('annihilate was not implemented for Ket') 
 
+    def __reduce__(self):
+        # pickle cannot store the read-only view of the state
+        return _rebuild_vector, (type(self), Ket, tuple(self.state.items()), self.sign)
+
     def __hash__(self) -> int:
         return hash((self.sign, *self.state))
 
-@dataclass(frozen=True)
+@dataclass
 class Bra(Expression):
     def __init__(self, state: Union[None, Tuple[Symbol], List[Symbol], Dict[Symbol, int]] = None, sign=Sign.POSITIVE):
         super().__init__(sign)
 
         if isinstance(state,dict):
-            self.state = {k:v for k, v in state.items()}
+            self._set(state=MappingProxyType({k:v for k, v in state.items()}))
         elif isinstance(state, list) or isinstance(state, tuple):
-            self.state = {k:1 for k in state}
+            self._set(state=MappingProxyType({k:1 for k in state}))
         elif state == None:
-            self.state = {}
+            self._set(state=MappingProxyType({}))
         
     def __neg__(self):
         raise NotImplementedError('unary negative was not implemented for Ket') 
@@ -317,10 +433,19 @@ class Bra(Expression):
 
         return Integer.ONE() if is_the_same else Integer.ZERO()
 
+    def __reduce__(self):
+        return _rebuild_vector, (type(self), Bra, tuple(self.state.items()), self.sign)
+
     def __hash__(self) -> int:
         return hash((self.sign, *self.state))
 
-@dataclass(frozen=True)
+def _rebuild_vector(cls: type, base: type, state: Tuple[Tuple[Symbol, int], ...], sign: Sign) -> Expression:
+    # the state was stored in order, so subclasses that reorder it are bypassed
+    vector = cls.__new__(cls)
+    base.__init__(vector, dict(state), sign)
+    return vector
+
+@dataclass(repr=False)
 class FermionKet(Ket):
     def __init__(self, *state: List[Symbol], sign=Sign.POSITIVE):
         ordered, order_sign = FermionKet._order(state)
@@ -346,23 +471,24 @@ class FermionKet(Ket):
     @classmethod
     def _order(cls, states: Tuple[List[Symbol]]) -> Tuple[List[Symbol], Sign]:
         result = []
-        resulting_sign = Sign.POSITIVE
+        parity = 0
 
         while len(states) > 0:
             element = min(states)
             index = states.index(element)
 
             states = states[:index] + states[index+1:]
-
-            index_sign = Sign.POSITIVE
-            if index % 2 != 0:
-                index_sign = Sign.NEGATIVE
-
-            resulting_sign *= index_sign
+            parity += index
 
             result.append(element)
         
-        return result, resulting_sign
+        return result, Sign.from_parity(parity)
+
+    @classmethod
+    def _from_ordered(cls, states: List[Symbol], sign: Sign = Sign.POSITIVE) -> 'FermionKet':
+        ket = cls.__new__(cls)
+        Ket.__init__(ket, states, sign)
+        return ket
 
     def order(self) -> 'FermionKet':
         result, resulting_sign = FermionKet._order(tuple(self.state.keys()))
@@ -386,11 +512,7 @@ class FermionKet(Ket):
 
         new_states = states[:index] + states[index+1:]
 
-        index_sign = Sign.POSITIVE
-        if index % 2 != 0:
-            index_sign = Sign.NEGATIVE
-
-        return new_states, index_sign
+        return new_states, Sign.from_parity(index)
 
     def annihilate(self, state: Symbol) -> 'FermionKet':
         result, resulting_sign = FermionKet._annihilate(state, list(self.state.keys()))
@@ -411,6 +533,12 @@ class FermionBra(Bra):
     def __neg__(self):
         return FermionBra(*list(self.state.keys()), sign=-self.sign)
 
+    @classmethod
+    def _from_ordered(cls, states: List[Symbol], sign: Sign = Sign.POSITIVE) -> 'FermionBra':
+        bra = cls.__new__(cls)
+        Bra.__init__(bra, states, sign)
+        return bra
+
     def order(self) -> 'FermionBra':
         result, resulting_sign = FermionKet._order(tuple(self.state.keys()))
         return FermionBra(*result, sign=self.sign * resulting_sign)
@@ -450,9 +578,8 @@ class FermionBra(Bra):
 
 class Operator(Expression):
     def __init__(self, name: str, dagger: bool=False, sign: Sign=Sign.POSITIVE):
-        self.name = name
-        self._dagger = dagger
         super().__init__(sign)
+        self._set(name=name, _dagger=dagger)
 
     def copy(self):
         return Operator(self.name, self._dagger, self.sign)
@@ -472,7 +599,7 @@ class Operator(Expression):
 class FermionCreation(Operator):
     def __init__(self, state: Symbol, sign: Sign=Sign.POSITIVE):
         super().__init__(f'c_{state}', dagger=True, sign=sign)
-        self.state = state.copy()
+        self._set(state=state.copy())
 
     def copy(self):
         return FermionCreation(self.state, self.sign)
@@ -491,7 +618,7 @@ class FermionCreation(Operator):
 class FermionAnnihilation(Operator):
     def __init__(self, state: Symbol, sign: Sign=Sign.POSITIVE):
         super().__init__(f'c_{state}', dagger=False, sign=sign)
-        self.state = state.copy() 
+        self._set(state=state.copy()) 
 
     def copy(self):
         return FermionAnnihilation(self.state, self.sign)
@@ -510,7 +637,163 @@ class FermionAnnihilation(Operator):
 Fd = FermionCreation
 F = FermionAnnihilation
 
-def expand(expression: Expression) -> Expression:
+# Built-in rules, tried in the order they are registered.
+
+@EXPAND_RULES.register(Multiplication, Addition)
+def _distribute_lhs(node: Multiplication) -> Expression:
+    rhs = node.rhs.expand()
+    return Addition(
+        Multiplication(node.lhs.lhs.expand(), rhs, node.sign),
+        Multiplication(node.lhs.rhs.expand(), rhs, node.sign)
+    )
+
+@EXPAND_RULES.register(Multiplication, None, Addition)
+def _distribute_rhs(node: Multiplication) -> Expression:
+    lhs = node.lhs.expand()
+    return Addition(
+        Multiplication(lhs, node.rhs.lhs.expand(), node.sign),
+        Multiplication(lhs, node.rhs.rhs.expand(), node.sign)
+    )
+
+@EXPAND_RULES.register(Multiplication, Multiplication)
+def _associate_right(node: Multiplication) -> Expression:
+    return Multiplication(
+        node.lhs.lhs.expand(),
+        Multiplication(node.lhs.rhs.expand(), node.rhs.expand(), node.lhs.sign),
+        node.sign)
+
+@EXPAND_RULES.register(Multiplication, None, Multiplication)
+def _scalar_to_front(node: Multiplication) -> Union[None, Expression]:
+    if isinstance(node.rhs.lhs, (Symbol, Integer)) and not isinstance(node.lhs, (Symbol, Integer)):
+        return Multiplication(
+            node.rhs.lhs,
+            Multiplication(node.lhs.expand(), node.rhs.rhs.expand(), node.rhs.sign),
+            node.sign)
+    return None
+
+@EXPAND_RULES.register(Multiplication, Symbol, Multiplication)
+def _integer_before_symbol(node: Multiplication) -> Union[None, Expression]:
+    if isinstance(node.rhs.lhs, Integer):
+        return Multiplication(
+            node.rhs.lhs,
+            Multiplication(node.lhs, node.rhs.rhs.expand(), node.rhs.sign),
+            node.sign
+        )
+    return None
+
+@SIMPLIFY_RULES.register(Addition, Integer, Integer)
+def _add_integers(node: Addition) -> Expression:
+    return node.lhs.add(node.rhs).mul_sign(node.sign)
+
+@SIMPLIFY_RULES.register(Addition, Integer)
+def _drop_zero_lhs(node: Addition) -> Union[None, Expression]:
+    return node.rhs.mul_sign(node.sign) if is_zero(node.lhs) else None
+
+@SIMPLIFY_RULES.register(Addition, None, Integer)
+def _drop_zero_rhs(node: Addition) -> Union[None, Expression]:
+    return node.lhs.mul_sign(node.sign) if is_zero(node.rhs) else None
+
+# A fermion product ends in its ket or, for a lone bra, in an operator. The
+# rhs of every such product is one of these, scalars are never on the right.
+_FERMION_ENDS = (Multiplication, FermionKet, FermionCreation, FermionAnnihilation)
+
+@SIMPLIFY_RULES.register(Multiplication, None, _FERMION_ENDS)
+def _apply_fermion_operators(node: Multiplication) -> Union[None, Expression]:
+    return _apply_operators(node)
+
+@SIMPLIFY_RULES.register(Multiplication, Operator, Ket)
+def _apply_operator(node: Multiplication) -> Expression:
+    return node.lhs.apply(node.rhs).mul_sign(node.sign)
+
+@SIMPLIFY_RULES.register(Multiplication, None, Integer)
+def _times_zero_rhs(node: Multiplication) -> Union[None, Expression]:
+    return Integer(0) if is_zero(node.rhs) else None
+
+@SIMPLIFY_RULES.register(Multiplication, Integer)
+def _times_zero_lhs(node: Multiplication) -> Union[None, Expression]:
+    return Integer(0) if is_zero(node.lhs) else None
+
+@SIMPLIFY_RULES.register(Multiplication, None, Integer)
+def _times_one_rhs(node: Multiplication) -> Union[None, Expression]:
+    return node.lhs.mul_sign(node.sign) if node.rhs == Integer(1) else None
+
+@SIMPLIFY_RULES.register(Multiplication, Integer)
+def _times_one_lhs(node: Multiplication) -> Union[None, Expression]:
+    return node.rhs.mul_sign(node.sign) if node.lhs == Integer(1) else None
+
+@SIMPLIFY_RULES.register(Multiplication, Bra, Ket)
+def _inner_product(node: Multiplication) -> Expression:
+    return node.lhs.inner(node.rhs).mul_sign(node.sign)
+
+def _apply_operators(node: Multiplication) -> Union[None, Expression]:
+    # Every Multiplication in a chain is tried on its own, flattening each
+    # one would make a single pass quadratic in the length of the chain.
+    if not isinstance(node.last, FermionKet) and not isinstance(node.first, FermionBra):
+        return None
+
+    product_factors, sign = factors(node)
+    scalars = [f for f in product_factors if isinstance(f, (Symbol, Integer))]
+    vectors = [f for f in product_factors if not isinstance(f, (Symbol, Integer))]
+
+    bra = vectors[0] if len(vectors) > 0 and isinstance(vectors[0], FermionBra) else None
+    ket = vectors[-1] if len(vectors) > 0 and isinstance(vectors[-1], FermionKet) else None
+    operators = vectors[1 if bra is not None else 0:-1 if ket is not None else len(vectors)]
+
+    # A bra and a ket with nothing but scalars between them are still
+    # compared here, their states can tell a particle number mismatch.
+    if (
+        (bra is None or ket is None) and len(operators) == 0
+        or (bra is None and ket is None)
+        or not all(isinstance(o, (FermionCreation, FermionAnnihilation)) for o in operators)
+    ):
+        return None
+
+    # A ket is acted on from the right, a lone bra from the left. Both
+    # keep their states ordered, so the sign of every step is the parity
+    # of the insertion or removal position.
+    if ket is not None:
+        states = list(ket.state)
+        steps = [(isinstance(o, FermionCreation), o.state) for o in reversed(operators)]
+    else:
+        states = list(bra.state)
+        steps = [(isinstance(o, FermionAnnihilation), o.state) for o in operators]
+
+    parity = 0
+    for create, state in steps:
+        position = bisect_left(states, state)
+        present = position < len(states) and states[position] == state
+
+        if create == present:
+            return Integer(0)
+        elif create:
+            states.insert(position, state)
+        else:
+            del states[position]
+
+        parity += position
+
+    sign = sign * Sign.from_parity(parity)
+    if ket is None:
+        result = FermionBra._from_ordered(states)
+    elif bra is not None:
+        if states != list(bra.state):
+            return Integer(0)
+        result = None
+    else:
+        result = FermionKet._from_ordered(states)
+
+    return product(scalars + ([] if result is None else [result])).mul_sign(sign)
+
+
+def expand(
+        expression: Expression,
+        max_order: Optional[Dict[Symbol, int]] = None,
+        max_operators: Optional[int] = None
+    ) -> Expression:
+    if max_order is not None or max_operators is not None:
+        truncation = _Truncation(max_order or {}, max_operators)
+        return balanced_summation(expand(term) for term in truncation.terms(expression))
+
     expression_hash = None
 
     while expression_hash != hash(expression):
@@ -519,6 +802,56 @@ def expand(expression: Expression) -> Expression:
 
     return expression
 
+class _Truncation:
+    # Degrees are counted per truncated symbol plus one slot for operators.
+    # The degree of a sum is the smallest degree of its summands, so a branch
+    # is only skipped when every term it would expand into is over the limit.
+    def __init__(self, max_order: Dict[Symbol, int], max_operators: Optional[int]):
+        self.names = [symbol.name for symbol in max_order]
+        self.operators = max_operators is not None
+        self.limits = tuple(max_order.values()) + ((max_operators,) if self.operators else ())
+        self.degrees: Dict[int, Tuple[Expression, Tuple[int, ...]]] = {}
+
+    def terms(self, expression: Expression) -> Iterator[Expression]:
+        yield from self.__terms(expression, self.limits)
+
+    def __degree(self, node: Expression) -> Tuple[int, ...]:
+        # the node is kept next to its degree so that its id stays taken
+        if id(node) in self.degrees:
+            return self.degrees[id(node)][1]
+
+        if isinstance(node, Addition):
+            degree = tuple(map(min, self.__degree(node.lhs), self.__degree(node.rhs)))
+        elif isinstance(node, Multiplication):
+            degree = tuple(map(sum, zip(self.__degree(node.lhs), self.__degree(node.rhs))))
+        else:
+            degree = tuple(
+                1 if isinstance(node, Symbol) and node.name == name else 0
+                for name in self.names
+            ) + ((1 if isinstance(node, Operator) else 0,) if self.operators else ())
+
+        self.degrees[id(node)] = (node, degree)
+        return degree
+
+    def __terms(self, node: Expression, budget: Tuple[int, ...]) -> Iterator[Expression]:
+        if any(d > b for d, b in zip(self.__degree(node), budget)):
+            return
+
+        if isinstance(node, Addition):
+            for child in (node.lhs, node.rhs):
+                for term in self.__terms(child, budget):
+                    yield term.mul_sign(node.sign)
+        elif isinstance(node, Multiplication):
+            # the left factor may only use what the right one leaves over,
+            # and the right factor what the chosen left term leaves over
+            rhs_degree = self.__degree(node.rhs)
+            for lhs in self.__terms(node.lhs, tuple(b - d for b, d in zip(budget, rhs_degree))):
+                lhs_budget = tuple(b - d for b, d in zip(budget, self.__degree(lhs)))
+                for rhs in self.__terms(node.rhs, lhs_budget):
+                    yield Multiplication(lhs, rhs, node.sign)
+        else:
+            yield node
+
 def simplify(expression : Expression) -> Expression:
     expression_hash = None
 
@@ -530,5 +863,103 @@ def simplify(expression : Expression) -> Expression:
    # print(repr(expression))
     return expression
 
+def terms(expression: Expression) -> Iterator[Expression]:
+    stack = [(expression, Sign.POSITIVE)]
+
+    while len(stack) > 0:
+        node, sign = stack.pop()
+
+        if isinstance(node, Addition):
+            sign = sign * node.sign
+            stack.append((node.rhs, sign))
+            stack.append((node.lhs, sign))
+        elif sign != Sign.POSITIVE:
+            yield node.mul_sign(sign)
+        else:
+            yield node
+
+def expanded_terms(expression: Expression) -> Iterator[Expression]:
+    for term in terms(expression):
+        if isinstance(term, Multiplication):
+            for lhs in expanded_terms(term.lhs):
+                for rhs in expanded_terms(term.rhs):
+                    yield Multiplication(lhs, rhs, term.sign)
+        else:
+            yield term
+
+def term_count(expression: Expression) -> int:
+    counts = {}
+    stack = [expression]
+
+    while len(stack) > 0:
+        node = stack[-1]
+
+        if isinstance(node, (Addition, Multiplication)):
+            missing = [c for c in (node.lhs, node.rhs) if id(c) not in counts]
+            if len(missing) > 0:
+                stack.extend(missing)
+                continue
+
+            lhs, rhs = counts[id(node.lhs)], counts[id(node.rhs)]
+            counts[id(node)] = lhs + rhs if isinstance(node, Addition) else lhs * rhs
+        else:
+            counts[id(node)] = 1
+
+        stack.pop()
+
+    return counts[id(expression)]
+
+def is_zero(expression: Expression) -> bool:
+    return isinstance(expression, Integer) and expression.number == 0
+
+def summation(expressions: Iterable[Expression]) -> Expression:
+    result = None
+
+    for expression in expressions:
+        result = expression if result is None else Addition(result, expression)
+
+    return Integer.ZERO() if result is None else result
+
+def balanced_summation(expressions: Iterable[Expression]) -> Expression:
+    # pairwise instead of a chain, the depth grows with log2 of the length
+    level = list(expressions)
+
+    if len(level) == 0:
+        return Integer.ZERO()
+
+    while len(level) > 1:
+        paired = [Addition(lhs, rhs) for lhs, rhs in zip(level[::2], level[1::2])]
+        level = paired + level[len(paired) * 2:]
+
+    return level[0]
+
+def factors(expression: Expression) -> Tuple[List[Expression], Sign]:
+    result = []
+    sign = Sign.POSITIVE
+    stack = [expression]
+
+    while len(stack) > 0:
+        node = stack.pop()
+        sign *= node.sign
+
+        if isinstance(node, Multiplication):
+            stack.append(node.rhs)
+            stack.append(node.lhs)
+        elif node.sign != Sign.POSITIVE:
+            result.append(node.mul_sign(node.sign.conjugate()))
+        else:
+            result.append(node)
+
+    return result, sign
+
+def product(expressions: Iterable[Expression]) -> Expression:
+    factors = list(expressions)
+
+    if len(factors) == 0:
+        return Integer.ONE()
 
+    result = factors[-1]
+    for factor in reversed(factors[:-1]):
+        result = Multiplication(factor, result)
 
+    return result
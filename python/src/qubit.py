@@ -0,0 +1,260 @@
+from dataclasses import dataclass
+from numbers import Number
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .quant import Expression, Symbol
+from .numeric import Values, orbitals, operator_terms
+
+PHASES = (1, 1j, -1, -1j)
+
+
+@dataclass(frozen=True)
+class PauliString:
+    # i^phase ⋅ Π_k X_k^(x_k) Z_k^(z_k)
+    x: int = 0
+    z: int = 0
+    phase: int = 0
+
+    def __mul__(self, other: 'PauliString') -> 'PauliString':
+        # Moving the X of `other` past the Z of `self` costs a -1 per qubit.
+        return PauliString(
+            self.x ^ other.x,
+            self.z ^ other.z,
+            (self.phase + other.phase + 2 * (self.z & other.x).bit_count()) % 4
+        )
+
+    def dagger(self) -> 'PauliString':
+        return PauliString(self.x, self.z, (2 * (self.x & self.z).bit_count() - self.phase) % 4)
+
+    def label(self, n_qubits: int) -> Tuple[str, complex]:
+        characters = []
+        for k in range(n_qubits):
+            characters.append('IXZY'[(self.x >> k & 1) | (self.z >> k & 1) << 1])
+
+        # X Z = -i Y, so every Y adds a factor of -i to the phase.
+        phase = (self.phase - (self.x & self.z).bit_count()) % 4
+        return ''.join(characters), PHASES[phase]
+
+    def __repr__(self):
+        n_qubits = max(self.x.bit_length(), self.z.bit_length(), 1)
+        label, coefficient = self.label(n_qubits)
+        return f'{coefficient}⋅{label}'
+
+
+class QubitOperator:
+    def __init__(self, n_qubits: int, terms: Optional[Dict[Tuple[int, int], complex]] = None):
+        self.n_qubits = n_qubits
+        self.terms: Dict[Tuple[int, int], complex] = {} if terms is None else terms
+
+    def add(self, string: PauliString, coefficient: Number = 1):
+        key = (string.x, string.z)
+        self.terms[key] = self.terms.get(key, 0) + coefficient * PHASES[string.phase]
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    def __iter__(self) -> Iterator[Tuple[PauliString, complex]]:
+        for (x, z), coefficient in self.terms.items():
+            yield PauliString(x, z), coefficient
+
+    def __add__(self, other: 'QubitOperator') -> 'QubitOperator':
+        result = QubitOperator(max(self.n_qubits, other.n_qubits), dict(self.terms))
+        for string, coefficient in other:
+            result.add(string, coefficient)
+        return result
+
+    def __mul__(self, other: 'QubitOperator') -> 'QubitOperator':
+        result = QubitOperator(max(self.n_qubits, other.n_qubits))
+        for lhs, lhs_coefficient in self:
+            for rhs, rhs_coefficient in other:
+                result.add(lhs * rhs, lhs_coefficient * rhs_coefficient)
+        return result
+
+    def compress(self, tolerance: float = 1e-12) -> 'QubitOperator':
+        return QubitOperator(self.n_qubits, {
+            key: coefficient for key, coefficient in self.terms.items()
+            if abs(coefficient) > tolerance
+        })
+
+    def labels(self) -> List[Tuple[str, complex]]:
+        result = []
+        for string, coefficient in self:
+            label, phase = string.label(self.n_qubits)
+            result.append((label, coefficient * phase))
+        return result
+
+    def to_arrays(self):
+        import numpy
+
+        dtype = numpy.uint64 if self.n_qubits <= 64 else object
+        x = numpy.fromiter((x for x, _ in self.terms), dtype=dtype, count=len(self.terms))
+        z = numpy.fromiter((z for _, z in self.terms), dtype=dtype, count=len(self.terms))
+        coefficients = numpy.fromiter(self.terms.values(), dtype=complex, count=len(self.terms))
+        return x, z, coefficients
+
+    def __repr__(self):
+        return ' + '.join([f'({coefficient})⋅{label}' for label, coefficient in self.labels()])
+
+
+class Encoding:
+    def __init__(self, rows: Sequence[int]):
+        # rows[i] is the set of orbitals whose occupation parity qubit i holds.
+        n = len(rows)
+        occupation = _inverse(rows)
+        parity = []
+
+        prefix = 0
+        for j in range(n):
+            parity.append(prefix)
+            prefix ^= occupation[j]
+
+        self._set_sets(
+            [sum(1 << i for i in range(n) if rows[i] >> j & 1) for j in range(n)],
+            parity,
+            occupation
+        )
+
+    def _set_sets(self, update: List[int], parity: List[int], occupation: List[int]):
+        # update[j]: the qubits that change with orbital j, parity[j]: the
+        # qubits holding the parity of the orbitals below j, occupation[j]:
+        # the qubits holding the occupation of j.
+        self.n_qubits = len(update)
+        self.update = update
+        self.parity = parity
+        self.occupation = occupation
+        self._images = {}
+
+    @classmethod
+    def _from_sets(cls, update: List[int], parity: List[int], occupation: List[int]) -> 'Encoding':
+        # The generic constructor inverts the matrix in O(n²) big-int work,
+        # the built-in encodings have closed forms instead.
+        encoding = cls.__new__(cls)
+        encoding._set_sets(update, parity, occupation)
+        return encoding
+
+    @classmethod
+    def jordan_wigner(cls, n_qubits: int) -> 'Encoding':
+        # qubit j holds the occupation of orbital j
+        return cls._from_sets(
+            [1 << j for j in range(n_qubits)],
+            [(1 << j) - 1 for j in range(n_qubits)],
+            [1 << j for j in range(n_qubits)]
+        )
+
+    @classmethod
+    def bravyi_kitaev(cls, n_qubits: int) -> 'Encoding':
+        # Fenwick tree: qubit i holds the parity of orbitals i & (i + 1) ... i.
+        # Orbital j is in qubit j and in the ancestors j | (j + 1), ...; the
+        # children of i are the roots of the subtrees that tile i & (i + 1) ... i - 1,
+        # and the prefix below j is tiled by the same walk started at j - 1.
+        update, parity, occupation = [], [], []
+
+        for j in range(n_qubits):
+            qubits, i = 0, j
+            while i < n_qubits:
+                qubits |= 1 << i
+                i |= i + 1
+            update.append(qubits)
+
+            qubits, k = 1 << j, j - 1
+            while k >= j & (j + 1):
+                qubits |= 1 << k
+                k = (k & (k + 1)) - 1
+            occupation.append(qubits)
+
+            qubits, k = 0, j - 1
+            while k >= 0:
+                qubits |= 1 << k
+                k = (k & (k + 1)) - 1
+            parity.append(qubits)
+
+        return cls._from_sets(update, parity, occupation)
+
+    def image(self, index: int, create: bool) -> Tuple[Tuple[PauliString, float], ...]:
+        # c†_j = X_U Z_P (1 + Z_R) / 2 with U the update, P the parity and R
+        # the occupation set of j; c_j is its hermitian conjugate.
+        key = (index, create)
+        if key not in self._images:
+            update = self.update[index]
+            parity = self.parity[index]
+            strings = (
+                PauliString(update, parity),
+                PauliString(update, parity ^ self.occupation[index])
+            )
+            if not create:
+                strings = tuple(
+                    PauliString(s.x, s.z, 2 * (s.z & s.x).bit_count() % 4)
+                    for s in strings
+                )
+            self._images[key] = tuple((s, 0.5) for s in strings)
+
+        return self._images[key]
+
+
+def transform(
+        expression: Expression,
+        encoding: Encoding,
+        orbital_order: Sequence[Symbol],
+        values: Optional[Values] = None
+    ) -> QubitOperator:
+    result: Dict[Tuple[int, int], complex] = {}
+
+    for coefficient, operators in operator_terms(expression, orbital_order, values):
+        partial = {(0, 0): complex(coefficient)}
+
+        for operator in operators:
+            image = encoding.image(*operator)
+            product = {}
+
+            for (x, z), value in partial.items():
+                for string, factor in image:
+                    sign = -1 if (z & string.x).bit_count() % 2 != 0 else 1
+                    key = (x ^ string.x, z ^ string.z)
+                    product[key] = product.get(key, 0) + sign * PHASES[string.phase] * factor * value
+
+            partial = product
+
+        for key, value in partial.items():
+            result[key] = result.get(key, 0) + value
+
+    return QubitOperator(encoding.n_qubits, result).compress()
+
+
+def jordan_wigner(
+        expression: Expression,
+        orbital_order: Optional[Sequence[Symbol]] = None,
+        values: Optional[Values] = None
+    ) -> QubitOperator:
+    orbital_order = orbitals(expression) if orbital_order is None else orbital_order
+    return transform(expression, Encoding.jordan_wigner(len(orbital_order)), orbital_order, values)
+
+
+def bravyi_kitaev(
+        expression: Expression,
+        orbital_order: Optional[Sequence[Symbol]] = None,
+        values: Optional[Values] = None
+    ) -> QubitOperator:
+    orbital_order = orbitals(expression) if orbital_order is None else orbital_order
+    return transform(expression, Encoding.bravyi_kitaev(len(orbital_order)), orbital_order, values)
+
+
+def _inverse(rows: Sequence[int]) -> List[int]:
+    # Inverts the GF(2) matrix and returns the rows of the inverse.
+    n = len(rows)
+    rows = list(rows)
+    inverse = [1 << i for i in range(n)]
+
+    for column in range(n):
+        pivot = next((r for r in range(column, n) if rows[r] >> column & 1), None)
+        if pivot is None:
+            raise ValueError('encoding matrix is not invertible')
+
+        rows[column], rows[pivot] = rows[pivot], rows[column]
+        inverse[column], inverse[pivot] = inverse[pivot], inverse[column]
+
+        for r in range(n):
+            if r != column and rows[r] >> column & 1:
+                rows[r] ^= rows[column]
+                inverse[r] ^= inverse[column]
+
+    return inverse
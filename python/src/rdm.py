@@ -0,0 +1,109 @@
+from itertools import combinations
+from numbers import Number
+from typing import Dict, Iterable, Optional, Sequence, Tuple, Union
+
+import numpy
+
+from .quant import Expression, Symbol, Integer, FermionKet
+from .numeric import Values, apply, monomials, to_mask
+
+State = Union[Expression, Iterable[Tuple[Number, FermionKet]]]
+
+
+def density_matrices(
+        state: State,
+        orbitals: Optional[Sequence[Symbol]] = None,
+        values: Optional[Values] = None
+    ) -> Tuple[numpy.ndarray, numpy.ndarray]:
+    # rdm1[p, q] = ⟨ψ|c†_p c_q|ψ⟩ and rdm2[p, q, r, s] = ⟨ψ|c†_p c†_q c_s c_r|ψ⟩
+    pairs = list(_pairs(state, values) if isinstance(state, Expression) else state)
+
+    if orbitals is None:
+        orbitals = sorted({orbital for _, ket in pairs for orbital in ket.state})
+
+    coefficients = _coefficients(pairs, orbitals)
+    n = len(orbitals)
+    rdm1 = numpy.zeros((n, n), dtype=complex)
+    rdm2 = numpy.zeros((n, n, n, n), dtype=complex)
+
+    for ket, ket_coefficient in coefficients.items():
+        occupied = [i for i in range(n) if ket >> i & 1]
+        empty = [i for i in range(n) if not ket >> i & 1]
+
+        weight = abs(ket_coefficient) ** 2
+        for p in occupied:
+            rdm1[p, p] += weight
+            for q in occupied:
+                if p != q:
+                    rdm2[p, q, p, q] += weight
+                    rdm2[p, q, q, p] -= weight
+
+        for q in occupied:
+            for p in empty:
+                bra = ket ^ (1 << q) ^ (1 << p)
+                if bra not in coefficients:
+                    continue
+
+                _, sign = apply(ket, ((p, True), (q, False)))
+                weight = sign * numpy.conj(coefficients[bra]) * ket_coefficient
+                rdm1[p, q] += weight
+
+                # c†_p c†_k c_k c_q = c†_p c_q on every k that stays occupied
+                for k in occupied:
+                    if k != q:
+                        rdm2[p, k, q, k] += weight
+                        rdm2[k, p, q, k] -= weight
+                        rdm2[p, k, k, q] -= weight
+                        rdm2[k, p, k, q] += weight
+
+        for q1, q2 in combinations(occupied, 2):
+            for p1, p2 in combinations(empty, 2):
+                bra = ket ^ (1 << q1) ^ (1 << q2) ^ (1 << p1) ^ (1 << p2)
+                if bra not in coefficients:
+                    continue
+
+                _, sign = apply(ket, ((p1, True), (p2, True), (q2, False), (q1, False)))
+                weight = sign * numpy.conj(coefficients[bra]) * ket_coefficient
+
+                rdm2[p1, p2, q1, q2] += weight
+                rdm2[p2, p1, q1, q2] -= weight
+                rdm2[p1, p2, q2, q1] -= weight
+                rdm2[p2, p1, q2, q1] += weight
+
+    if all(numpy.isreal(c) for c in coefficients.values()):
+        return rdm1.real, rdm2.real
+    return rdm1, rdm2
+
+
+def _pairs(state: Expression, values: Optional[Values]) -> Iterable[Tuple[Number, FermionKet]]:
+    values = {} if values is None else values
+
+    for term_factors, sign in monomials(state):
+        coefficient = sign.number()
+        kets = []
+
+        for factor in term_factors:
+            if isinstance(factor, Integer):
+                coefficient *= factor.number
+            elif isinstance(factor, FermionKet):
+                kets.append(factor)
+            elif isinstance(factor, Symbol) and factor in values:
+                coefficient *= values[factor]
+            else:
+                raise ValueError(f'{factor} is not a numeric coefficient of a FermionKet')
+
+        if len(kets) != 1:
+            raise ValueError('every summand of the state needs exactly one FermionKet')
+
+        yield coefficient, kets[0]
+
+
+def _coefficients(pairs: Iterable[Tuple[Number, FermionKet]], orbitals: Sequence[Symbol]) -> Dict[int, Number]:
+    index = {orbital: i for i, orbital in enumerate(orbitals)}
+    coefficients: Dict[int, Number] = {}
+
+    for coefficient, ket in pairs:
+        mask, sign = to_mask(ket, index)
+        coefficients[mask] = coefficients.get(mask, 0) + sign * coefficient
+
+    return {mask: c for mask, c in coefficients.items() if c != 0}
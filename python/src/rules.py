@@ -0,0 +1,96 @@
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type, Union
+
+Pattern = Union[None, Type, Tuple[Type, ...]]
+Shape = Tuple[Type, Type, Type]
+
+
+@dataclass(frozen=True)
+class Rule:
+    head: Pattern
+    lhs: Pattern
+    rhs: Pattern
+    function: Callable[[Any], Any]
+    priority: int = 0
+
+    @property
+    def name(self) -> str:
+        return self.function.__name__
+
+    def matches(self, shape: Shape) -> bool:
+        return all(
+            pattern is None or issubclass(kind, pattern)
+            for pattern, kind in zip((self.head, self.lhs, self.rhs), shape)
+        )
+
+
+class RuleRegistry:
+    # A rule is tried on a node when its head, lhs and rhs patterns match the
+    # types of the node and of its children. Which rules match depends on
+    # those three types alone, so the candidates are computed once per shape
+    # and looked up from then on. A rule returns None when it does not apply.
+    def __init__(self, name: str):
+        self.name = name
+        self._rules: List[Rule] = []
+        self._index: Dict[Shape, Tuple[Callable[[Any], Any], ...]] = {}
+        self._heads: Dict[Type, bool] = {}
+
+    def __len__(self) -> int:
+        return len(self._rules)
+
+    def __iter__(self):
+        return iter(self._rules)
+
+    def register(self, head: Pattern = None, lhs: Pattern = None, rhs: Pattern = None, priority: int = 0):
+        def decorator(function: Callable[[Any], Any]) -> Callable[[Any], Any]:
+            self.add(Rule(head, lhs, rhs, function, priority))
+            return function
+
+        return decorator
+
+    def add(self, rule: Rule):
+        # stable, so rules of the same priority keep their registration order
+        self._rules.append(rule)
+        self._rules.sort(key=lambda r: r.priority)
+        self._index = {}
+        self._heads = {}
+
+    def remove(self, function: Callable[[Any], Any]):
+        remaining = [rule for rule in self._rules if rule.function is not function]
+        if len(remaining) == len(self._rules):
+            raise ValueError(f'{function.__name__} is not a {self.name} rule')
+
+        self._rules = remaining
+        self._index = {}
+        self._heads = {}
+
+    def candidates(self, node: Any) -> Tuple[Callable[[Any], Any], ...]:
+        # Most nodes are leaves no rule is registered for, those are turned
+        # away on their own type before the children are looked at.
+        head = type(node)
+        possible = self._heads.get(head)
+        if possible is None:
+            possible = any(rule.head is None or issubclass(head, rule.head) for rule in self._rules)
+            self._heads[head] = possible
+        if not possible:
+            return ()
+
+        shape = (head, type(getattr(node, 'lhs', None)), type(getattr(node, 'rhs', None)))
+        rules = self._index.get(shape)
+
+        if rules is None:
+            rules = tuple(rule.function for rule in self._rules if rule.matches(shape))
+            self._index[shape] = rules
+
+        return rules
+
+    def apply(self, node: Any) -> Optional[Any]:
+        if self._heads.get(type(node)) is False:
+            return None
+
+        for function in self.candidates(node):
+            result = function(node)
+            if result is not None:
+                return result
+
+        return None
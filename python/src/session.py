@@ -0,0 +1,119 @@
+from typing import Dict, List, Optional
+
+from .quant import Expression, Integer, Addition, Multiplication, expand, simplify, terms, is_zero
+
+
+class Session:
+    def __init__(self, bra: Optional[Expression] = None, ket: Optional[Expression] = None):
+        self.bra = bra
+        self.ket = ket
+
+        self._terms: Dict[int, Expression] = {}
+        self._results: Dict[int, Expression] = {}
+        self._slots: Dict[int, int] = {}
+        self._free: List[int] = []
+        self._next_key = 0
+        self._sums = _SumTree()
+
+    def __len__(self) -> int:
+        return len(self._terms)
+
+    def __getitem__(self, key: int) -> Expression:
+        return self._terms[key]
+
+    def __iadd__(self, expression: Expression) -> 'Session':
+        self.add(expression)
+        return self
+
+    def keys(self) -> List[int]:
+        return list(self._terms.keys())
+
+    def normalize(self, term: Expression) -> Expression:
+        if self.bra is not None:
+            term = Multiplication(self.bra, term)
+        if self.ket is not None:
+            term = Multiplication(term, self.ket)
+
+        return simplify(expand(term))
+
+    def add(self, expression: Expression) -> List[int]:
+        keys = []
+
+        for term in terms(expression):
+            key = self._next_key
+            self._next_key += 1
+
+            result = self.normalize(term)
+            self._terms[key] = term
+            self._results[key] = result
+            keys.append(key)
+
+            # slots of removed terms are reused, so the tree stays as small
+            # as the largest the session has been
+            slot = self._free.pop() if len(self._free) > 0 else len(self._slots)
+            self._slots[key] = slot
+            self._sums.set(slot, result)
+
+        return keys
+
+    def remove(self, key: int) -> Expression:
+        term = self._terms.pop(key)
+        del self._results[key]
+
+        slot = self._slots.pop(key)
+        self._sums.set(slot, Integer.ZERO())
+        self._free.append(slot)
+
+        return term
+
+    def replace(self, key: int, expression: Expression) -> List[int]:
+        self.remove(key)
+        return self.add(expression)
+
+    def result(self) -> Expression:
+        return self._sums.root()
+
+
+class _SumTree:
+    # The results sit in the leaves of a complete binary tree and every inner
+    # node holds the Addition of its two children. Nodes are immutable, so an
+    # edit only rebuilds the path from its leaf to the root, and the depth of
+    # the aggregate is the log2 of the number of slots.
+    def __init__(self):
+        self._capacity = 1
+        self._nodes: List[Expression] = [Integer.ZERO(), Integer.ZERO()]
+
+    def root(self) -> Expression:
+        return self._nodes[1]
+
+    def set(self, slot: int, expression: Expression):
+        if slot >= self._capacity:
+            self._grow(slot + 1)
+
+        index = self._capacity + slot
+        self._nodes[index] = expression
+
+        while index > 1:
+            index //= 2
+            self._nodes[index] = _add(self._nodes[2 * index], self._nodes[2 * index + 1])
+
+    def _grow(self, size: int):
+        capacity = self._capacity
+        while capacity < size:
+            capacity *= 2
+
+        leaves = self._nodes[self._capacity:]
+        zeros = [Integer.ZERO()] * (capacity - len(leaves))
+        self._nodes = [Integer.ZERO()] * capacity + leaves + zeros
+        self._capacity = capacity
+
+        for index in range(capacity - 1, 0, -1):
+            self._nodes[index] = _add(self._nodes[2 * index], self._nodes[2 * index + 1])
+
+
+def _add(lhs: Expression, rhs: Expression) -> Expression:
+    if is_zero(lhs):
+        return rhs
+    elif is_zero(rhs):
+        return lhs
+    return Addition(lhs, rhs)
@@ -0,0 +1,133 @@
+import cmath
+import math
+from itertools import combinations
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy
+
+from .quant import Expression, Symbol
+from .numeric import OperatorString, Values, apply, operator_terms
+
+
+class TranslationBasis:
+    def __init__(self, n_sites: int, n_flavors: int = 1, n_particles: Optional[int] = None):
+        # Orbitals are numbered site-major, orbital = site * n_flavors + flavor,
+        # so a translation by one site is a rotation of the mask.
+        self.n_sites = n_sites
+        self.n_flavors = n_flavors
+        self.n_orbitals = n_sites * n_flavors
+
+        self.representatives: List[int] = []
+        self.periods: Dict[int, int] = {}
+        self.characters: Dict[int, int] = {}
+
+        for mask in _masks(self.n_orbitals, n_particles):
+            representative, _, _ = self.representative(mask)
+            if representative != mask:
+                continue
+
+            period, character = self._period(mask)
+            self.representatives.append(mask)
+            self.periods[mask] = period
+            self.characters[mask] = character
+
+    def translate(self, mask: int) -> Tuple[int, int]:
+        shift = self.n_orbitals - self.n_flavors
+        wrapped = mask >> shift
+        rotated = ((mask << self.n_flavors) | wrapped) & ((1 << self.n_orbitals) - 1)
+
+        # the wrapped creators move in front of all others
+        moved = wrapped.bit_count()
+        sign = -1 if moved * (mask.bit_count() - moved) % 2 != 0 else 1
+        return rotated, sign
+
+    def representative(self, mask: int) -> Tuple[int, int, int]:
+        # returns (r, d, σ) with T^d |mask⟩ = σ |r⟩ and r the smallest mask of the orbit
+        best, distance, best_sign = mask, 0, 1
+        current, sign = mask, 1
+
+        for j in range(1, self.n_sites):
+            current, step = self.translate(current)
+            sign *= step
+
+            if current == mask:
+                break
+            if current < best:
+                best, distance, best_sign = current, j, sign
+
+        return best, distance, best_sign
+
+    def compatible(self, representative: int, momentum: int) -> bool:
+        phase = self.characters[representative] * cmath.exp(
+            -2j * math.pi * momentum * self.periods[representative] / self.n_sites
+        )
+        return abs(phase - 1) < 1e-9
+
+    def sector(self, momentum: int) -> List[int]:
+        return [r for r in self.representatives if self.compatible(r, momentum)]
+
+    def block(self, terms: Sequence[Tuple[complex, OperatorString]], momentum: int) -> numpy.ndarray:
+        # ⟨r',k|H|r,k⟩ with |r,k⟩ = √R_r / L Σ_j e^(-ikj) T^j |r⟩
+        states = self.sector(momentum)
+        position = {r: i for i, r in enumerate(states)}
+        k = 2 * math.pi * momentum / self.n_sites
+
+        matrix = numpy.zeros((len(states), len(states)), dtype=complex)
+
+        for column, ket in enumerate(states):
+            for coefficient, operators in terms:
+                mask, sign = apply(ket, operators)
+                if sign == 0:
+                    continue
+
+                bra, distance, translation_sign = self.representative(mask)
+                if bra not in position:
+                    continue
+
+                matrix[position[bra], column] += (
+                    coefficient * sign * translation_sign
+                    * cmath.exp(-1j * k * distance)
+                    * math.sqrt(self.periods[ket] / self.periods[bra])
+                )
+
+        return matrix
+
+    def _period(self, mask: int) -> Tuple[int, int]:
+        current, character = mask, 1
+
+        for period in range(1, self.n_sites + 1):
+            current, sign = self.translate(current)
+            character *= sign
+
+            if current == mask:
+                return period, character
+
+        raise ValueError('translation does not close on the lattice')
+
+
+def momentum_blocks(
+        hamiltonian: Expression,
+        orbitals: Sequence[Symbol],
+        n_sites: int,
+        n_particles: Optional[int] = None,
+        values: Optional[Values] = None
+    ) -> Dict[int, numpy.ndarray]:
+    if len(orbitals) % n_sites != 0:
+        raise ValueError('the number of orbitals is not a multiple of the number of sites')
+
+    basis = TranslationBasis(n_sites, len(orbitals) // n_sites, n_particles)
+    terms = list(operator_terms(hamiltonian, orbitals, values))
+
+    return {
+        momentum: basis.block(terms, momentum)
+        for momentum in range(n_sites)
+    }
+
+
+def _masks(n_orbitals: int, n_particles: Optional[int]):
+    if n_particles is None:
+        yield from range(1 << n_orbitals)
+        return
+
+    for occupied in combinations(range(n_orbitals), n_particles):
+        yield sum(1 << i for i in occupied)
@@ -0,0 +1,199 @@
+import html
+import io
+from itertools import islice
+from typing import List, TextIO
+
+from .quant import (
+    Sign,
+    Expression,
+    Symbol,
+    Integer,
+    Addition,
+    Multiplication,
+    Ket,
+    Bra,
+    Operator,
+    FermionCreation,
+    FermionAnnihilation,
+    terms,
+)
+
+BUFFER_SIZE = 4096
+
+LATEX_SIGNS = {
+    Sign.POSITIVE: '',
+    Sign.IMAGINARY: 'i \\, ',
+    Sign.NEGATIVE: '-',
+    Sign.NEGATIVE_IMAGINARY: '-i \\, ',
+}
+
+
+def write(expression: Expression, stream: TextIO, latex: bool = False):
+    _write(expression, stream, latex, True)
+
+
+def _write(expression: Expression, stream: TextIO, latex: bool, print_sign: bool):
+    buffer: List[str] = []
+    render = _latex_tokens if latex else _text_tokens
+
+    # The stack holds either finished text or (node, print_sign) pairs, so
+    # arbitrarily deep chains are written without recursion.
+    stack = [(expression, print_sign)]
+
+    while len(stack) > 0:
+        item = stack.pop()
+
+        if isinstance(item, str):
+            buffer.append(item)
+        else:
+            node, print_sign = item
+            stack.extend(reversed(render(node, print_sign)))
+
+        if len(buffer) >= BUFFER_SIZE:
+            stream.write(''.join(buffer))
+            buffer.clear()
+
+    stream.write(''.join(buffer))
+
+
+def to_string(expression: Expression, latex: bool = False) -> str:
+    stream = io.StringIO()
+    write(expression, stream, latex)
+    return stream.getvalue()
+
+
+def count_terms(expression: Expression) -> int:
+    count = 0
+    stack = [expression]
+
+    while len(stack) > 0:
+        node = stack.pop()
+
+        if isinstance(node, Addition):
+            stack.append(node.rhs)
+            stack.append(node.lhs)
+        else:
+            count += 1
+
+    return count
+
+
+def summary(expression: Expression, limit: int = 5, latex: bool = False) -> str:
+    count = count_terms(expression)
+    parts = []
+
+    for term in islice(terms(expression), limit):
+        negative = term.sign.is_negative()
+
+        if len(parts) > 0:
+            parts.append(' - ' if negative else ' + ')
+        elif negative:
+            parts.append('-')
+
+        # what is left of the phase after the minus is taken out
+        parts.append(_sign_text(-term.sign if negative else term.sign, latex))
+        parts.append(_without_sign(term, latex))
+
+    if count > limit:
+        parts.append(r' + \ldots' if latex else ' + …')
+
+    text = ''.join(parts)
+
+    if count == 1:
+        return text
+    if latex:
+        return rf'{text} \quad \text{{({count} terms)}}'
+    return f'{text}  ({count} terms)'
+
+
+def repr_html(expression: Expression, limit: int = 5) -> str:
+    return f'<pre>{html.escape(summary(expression, limit))}</pre>'
+
+
+def repr_latex(expression: Expression, limit: int = 5) -> str:
+    return f'${summary(expression, limit, latex=True)}$'
+
+
+def _without_sign(expression: Expression, latex: bool) -> str:
+    stream = io.StringIO()
+    _write(expression, stream, latex, False)
+    return stream.getvalue()
+
+
+def _sign(node: Expression, print_sign: bool, latex: bool = False) -> str:
+    return _sign_text(node.sign, latex) if print_sign else ''
+
+
+def _sign_text(sign: Sign, latex: bool) -> str:
+    return LATEX_SIGNS[sign] if latex else str(sign)
+
+
+def _state_list(node: Expression, latex: bool) -> str:
+    if latex:
+        return ', '.join([
+            f'{s.name}{"" if n == 1 else "^{" + str(n) + "}"}'
+            for s, n in node.state.items()
+        ])
+    return ', '.join([
+        f'{s}{"" if n == 1 else ":" + str(n)}'
+        for s, n in node.state.items()
+    ])
+
+
+def _text_tokens(node: Expression, print_sign: bool) -> list:
+    sign = _sign(node, print_sign)
+
+    if isinstance(node, Addition):
+        if node.rhs.sign.is_negative():
+            return [f'{sign}(', (node.lhs, True), f' - {-node.rhs.sign}', (node.rhs, False), ')']
+        return [f'{sign}(', (node.lhs, True), ' + ', (node.rhs, True), ')']
+    elif isinstance(node, Multiplication):
+        return [f'{sign}[', (node.lhs, True), '⋅', (node.rhs, True), ']']
+    elif isinstance(node, Symbol):
+        return [f'{sign}{node.name}']
+    elif isinstance(node, Integer):
+        return [f'{sign}{node.number}']
+    elif isinstance(node, Operator):
+        return [f'{sign}{node.name}{"†" if node._dagger else ""}']
+    elif isinstance(node, Ket):
+        return [f'{sign}|{_state_list(node, False)}⟩']
+    elif isinstance(node, Bra):
+        return [f'{sign}⟨{_state_list(node, False)}|']
+
+    return [_fallback(node, print_sign)]
+
+
+def _latex_tokens(node: Expression, print_sign: bool) -> list:
+    sign = _sign(node, print_sign, latex=True)
+
+    if isinstance(node, Addition):
+        if node.rhs.sign.is_negative():
+            operator = f' - {LATEX_SIGNS[-node.rhs.sign]}'
+            return [f'{sign}\\left(', (node.lhs, True), operator, (node.rhs, False), '\\right)']
+        return [f'{sign}\\left(', (node.lhs, True), ' + ', (node.rhs, True), '\\right)']
+    elif isinstance(node, Multiplication):
+        return [sign, (node.lhs, True), ' \\, ', (node.rhs, True)]
+    elif isinstance(node, Symbol):
+        return [f'{sign}{node.name}']
+    elif isinstance(node, Integer):
+        return [f'{sign}{node.number}']
+    elif isinstance(node, FermionCreation):
+        return [f'{sign}c^{{\\dagger}}_{{{node.state.name}}}']
+    elif isinstance(node, FermionAnnihilation):
+        return [f'{sign}c_{{{node.state.name}}}']
+    elif isinstance(node, Operator):
+        dagger = '^{\\dagger}' if node._dagger else ''
+        return [f'{sign}{node.name}{dagger}']
+    elif isinstance(node, Ket):
+        return [f'{sign}\\left|{_state_list(node, True)}\\right\\rangle']
+    elif isinstance(node, Bra):
+        return [f'{sign}\\left\\langle {_state_list(node, True)}\\right|']
+
+    return [f'\\text{{{_fallback(node, print_sign)}}}']
+
+
+def _fallback(node: Expression, print_sign: bool) -> str:
+    text = repr(node)
+    if not print_sign and text.startswith(str(node.sign)):
+        text = text[len(str(node.sign)):]
+    return text
@@ -0,0 +1,123 @@
+import os
+import tempfile
+import unittest
+from itertools import product as cartesian
+from math import factorial
+
+from src.quant import Integer, Symbol, Sign, FermionKet, Fd, product
+from src.accumulator import Accumulator, MAX_RUNS
+from src.writer import to_string
+
+a = Symbol("a")
+b = Symbol("b")
+c = Symbol("c")
+
+power = product([a + b + Integer(2) * c] * 4)
+
+def key(names):
+    # the writer's form of a right-nested product, spelled out by hand
+    text = names[-1]
+    for name in reversed(names[:-1]):
+        text = f'[{name}⋅{text}]'
+    return text
+
+def multinomial(weights, n):
+    # coefficients of (Σ weight⋅name)^n by their sorted monomial
+    result = {}
+    for powers in cartesian(range(n + 1), repeat=len(weights)):
+        if sum(powers) != n:
+            continue
+
+        coefficient = factorial(n)
+        names = []
+        for (name, weight), power in zip(sorted(weights.items()), powers):
+            coefficient = coefficient // factorial(power) * weight ** power
+            names += [name] * power
+
+        result[key(names)] = coefficient
+    return result
+
+class TestAccumulator(unittest.TestCase):
+    def test_spilled_runs_match_memory(self):
+        with Accumulator() as memory, Accumulator(memory_limit=2000) as spilled:
+            memory.add(power)
+            spilled.add(power)
+
+            self.assertEqual(memory.runs, [])
+            self.assertGreater(len(spilled.runs), 1)
+            self.assertEqual(list(spilled.items()), list(memory.items()))
+
+        self.assertEqual(len(list(Accumulator().items())), 0)
+
+    def test_coefficients_are_combined(self):
+        with Accumulator(memory_limit=1) as accumulator:
+            accumulator.add(power)
+            accumulator.add(-(a * (a * (a * a))))
+            items = dict(accumulator.items())
+
+        expected = multinomial({'a': 1, 'b': 1, 'c': 2}, 4)
+        del expected['[a⋅[a⋅[a⋅a]]]']
+        self.assertEqual(items, expected)
+        self.assertEqual(items['[c⋅[c⋅[c⋅c]]]'], 16)
+        self.assertNotIn('[a⋅[a⋅[a⋅a]]]', items)
+
+    def test_number_of_runs_is_bounded(self):
+        expression = product([a + b + c] * 5)
+
+        with Accumulator(memory_limit=1) as accumulator:
+            accumulator.add(expression)
+            self.assertLess(len(accumulator.runs), MAX_RUNS)
+            self.assertEqual(dict(accumulator.items()), multinomial({'a': 1, 'b': 1, 'c': 1}, 5))
+
+    def test_commuting_scalars_share_a_key(self):
+        with Accumulator() as accumulator:
+            accumulator.add(product([a + b] * 3))
+            self.assertEqual(dict(accumulator.items()), {
+                '[a⋅[a⋅a]]': 1, '[a⋅[a⋅b]]': 3, '[a⋅[b⋅b]]': 3, '[b⋅[b⋅b]]': 1
+            })
+
+        with Accumulator() as accumulator:
+            accumulator.add(power)
+            self.assertEqual(len(list(accumulator.items())), 15)
+
+    def test_spilled_kets_keep_operator_order(self):
+        with Accumulator(memory_limit=1) as accumulator:
+            accumulator.add(b * a * Fd(c) * FermionKet(a) + a * b * Fd(c) * FermionKet(a))
+            accumulator.add(a * FermionKet(a) * Fd(c))
+            self.assertGreater(len(accumulator.runs), 1)
+
+            self.assertEqual(dict(accumulator.items()), {
+                '[a⋅[b⋅[c_c†⋅|a⟩]]]': 2, '[a⋅[|a⟩⋅c_c†]]': 1
+            })
+
+    def test_terms_and_complex_coefficients(self):
+        i = Integer(1, Sign.IMAGINARY)
+
+        with Accumulator(memory_limit=1) as accumulator:
+            accumulator.add(a * b + i * a * b + Integer(3) * c + i * c)
+            terms = sorted(to_string(term) for term in accumulator.terms())
+
+        self.assertEqual(terms, ['[(1 + i⋅1)⋅[a⋅b]]', '[c⋅(3 + i⋅1)]'])
+
+    def test_table(self):
+        expected = multinomial({'a': 1, 'b': 1, 'c': 2}, 4)
+
+        with tempfile.TemporaryDirectory() as directory:
+            with Accumulator(memory_limit=5000, directory=directory) as accumulator:
+                accumulator.add(power)
+                table = accumulator.to_table(os.path.join(directory, 'table'))
+
+                keys = [key for key, _ in table]
+                self.assertEqual(keys, sorted(keys))
+                self.assertEqual(len(table), len(expected))
+                for key, coefficient in expected.items():
+                    self.assertEqual(table.find(key), coefficient)
+                self.assertIsNone(table.find('[a⋅d]'))
+
+                with self.assertRaises(IndexError):
+                    table[len(table)]
+
+            self.assertEqual(sorted(os.listdir(directory)), ['table'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,6 @@
 import unittest
 
-from src.quant import Addition, Symbol
+from src.quant import Addition, Symbol, Sign
 
 class TestAddition(unittest.TestCase):
     def test_addition_print(self):
@@ -36,6 +36,22 @@ class TestAddition(unittest.TestCase):
         self.assertEqual(repr(-a - b), '-(a + b)')
         self.assertEqual(repr(-(-a - b)), '(a + b)')
 
+    def test_addition_keeps_shared_children(self):
+        a = -Symbol('a')
+        b = -Symbol('b')
+
+        self.assertEqual(repr(a + b), '-(a + b)')
+        self.assertEqual(repr(a), '-a')
+        self.assertEqual(repr(b), '-b')
+
+    def test_addition_imaginary_phases(self):
+        a = Symbol('a', Sign.IMAGINARY)
+        b = Symbol('b', Sign.IMAGINARY)
+
+        self.assertEqual(repr(a + b), 'i⋅(a + b)')
+        self.assertEqual(repr(a - b), '(i⋅a - i⋅b)')
+        self.assertEqual(repr(-a - b), '-i⋅(a + b)')
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
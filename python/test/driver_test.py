@@ -0,0 +1,125 @@
+import asyncio
+import os
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+from src.quant import Integer, Symbol, FermionKet, FermionBra, Fd, F, expand, simplify, summation, balanced_summation, terms
+from src.driver import Job, Cancelled, normalize, run, run_async, run_threaded
+
+a = Symbol("a")
+b = Symbol("b")
+c = Symbol("c")
+t = Symbol("t")
+u = Symbol("u")
+
+H = t * Fd(a) * F(b) + t * Fd(b) * F(a) + u * Fd(a) * F(a) + u * Fd(b) * F(b) + Integer(2) * Fd(c) * F(c)
+problem = FermionBra(a) * H * FermionKet(a) + FermionBra(b) * H * FermionKet(a) + FermionBra(a, c) * H * FermionKet(a, c)
+
+class TestDriver(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.checkpoint = os.path.join(self.directory.name, 'job.pickle')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_run_matches_simplify(self):
+        self.assertEqual(repr(run(problem, chunk_size=2)), '((u + t) + (u + 2))')
+        self.assertEqual(repr(simplify(expand(FermionBra(a) * H * FermionKet(a)))), 'u')
+
+    def test_run_reports_progress(self):
+        reports = []
+        run(problem, chunk_size=4, progress=reports.append)
+
+        self.assertEqual([p.done for p in reports], [4, 8, 12, 15])
+        self.assertTrue(all(p.total == 15 for p in reports))
+        self.assertEqual(reports[-1].remaining, 0)
+
+    def test_cancel_and_resume(self):
+        def cancel_after_first_chunk(progress):
+            job.cancel()
+
+        job = Job(problem, checkpoint=self.checkpoint, chunk_size=4, progress=cancel_after_first_chunk)
+        with self.assertRaises(Cancelled):
+            job.run()
+
+        resumed = Job(problem, checkpoint=self.checkpoint, chunk_size=4)
+        self.assertEqual(resumed.done, 4)
+        self.assertEqual(repr(resumed.run()), '((u + t) + (u + 2))')
+
+    def test_checkpoint_keeps_kets(self):
+        hops = Fd(b) * F(a) * FermionKet(a) + Fd(a) * F(b) * FermionKet(b) + Fd(c) * F(a) * FermionKet(a, b)
+
+        def cancel_after_first_chunk(progress):
+            job.cancel()
+
+        job = Job(hops, checkpoint=self.checkpoint, chunk_size=2, progress=cancel_after_first_chunk)
+        with self.assertRaises(Cancelled):
+            job.run()
+
+        resumed = Job(hops, checkpoint=self.checkpoint, chunk_size=2)
+        self.assertEqual(repr(resumed.results), '[|b⟩, |a⟩]')
+        self.assertEqual(repr(resumed.run()), '((|b⟩ + |a⟩) - |b, c⟩)')
+
+    def test_checkpoint_of_other_expression(self):
+        Job(problem, checkpoint=self.checkpoint).run()
+
+        with self.assertRaises(ValueError):
+            Job(H, checkpoint=self.checkpoint)
+
+    def test_run_async(self):
+        result = asyncio.run(run_async(problem, chunk_size=3))
+        self.assertEqual(repr(result), '((u + t) + (u + 2))')
+
+    def test_cancel_async_waits_for_chunk(self):
+        job = Job(problem, checkpoint=self.checkpoint, chunk_size=4)
+        started, release = threading.Event(), threading.Event()
+
+        def blocking_normalize(term):
+            started.set()
+            release.wait()
+            return normalize(term)
+
+        async def cancel_during_first_chunk():
+            task = asyncio.ensure_future(job.run_async())
+            await asyncio.get_running_loop().run_in_executor(None, started.wait)
+
+            task.cancel()
+            await asyncio.sleep(0)
+            release.set()
+
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+
+        with mock.patch('src.driver.normalize', blocking_normalize):
+            asyncio.run(cancel_during_first_chunk())
+
+        resumed = Job(problem, checkpoint=self.checkpoint, chunk_size=4)
+        self.assertEqual((job.done, resumed.done), (4, 4))
+        self.assertEqual(len(resumed.results), len(job.results))
+        self.assertEqual(repr(resumed.run()), '((u + t) + (u + 2))')
+        self.assertEqual(os.listdir(self.directory.name), ['job.pickle'])
+
+    def test_large_results_stay_usable(self):
+        symbols = balanced_summation(Symbol(f's{n}') for n in range(3000))
+
+        for result in (run(symbols, chunk_size=500), run_threaded(symbols, workers=4)):
+            hash(result)
+            self.assertEqual(sum(1 for _ in terms(simplify(result))), 3000)
+
+    def test_run_threaded(self):
+        self.assertEqual(repr(run_threaded(problem, workers=4, chunk_size=2)), '((u + t) + (u + 2))')
+
+    def test_run_threaded_shares_nodes(self):
+        shared = -a
+        terms = summation([shared * FermionBra(b) * Fd(b) * F(a) * FermionKet(a)] * 200)
+
+        result = run_threaded(terms, workers=8, chunk_size=1)
+
+        self.assertEqual(repr(shared), '-a')
+        self.assertEqual(repr(result), repr(run(terms)))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+import unittest
+
+from src.quant import Symbol, FermionKet, expand, simplify
+from src.excitations import excitations
+
+orbitals = [Symbol(name) for name in 'abcdef']
+a, b, c, d, e, f = orbitals
+
+class TestExcitations(unittest.TestCase):
+    def test_level_sizes(self):
+        space = excitations(FermionKet(a, b, c), orbitals, max_level=3)
+
+        self.assertEqual([len(level) for level in space.levels], [1, 9, 9, 1])
+        self.assertEqual(len(space), 20)
+        self.assertEqual(int(space[0].determinants[0]), 0b000111)
+
+    def test_max_level(self):
+        space = excitations(FermionKet(a, b), orbitals)
+
+        self.assertEqual([len(level) for level in space.levels], [1, 8, 6])
+        self.assertEqual(space[2].holes.shape, (6, 2))
+        self.assertEqual(space[2].particles.shape, (6, 2))
+
+    def test_operator(self):
+        space = excitations(FermionKet(a, b), orbitals)
+        self.assertEqual(repr(space.operator(2, 0)), '[c_c†⋅[c_d†⋅[c_b⋅c_a]]]')
+
+    def test_phases_match_symbolic_excitation(self):
+        reference = FermionKet(b, d, e)
+        space = excitations(reference, orbitals, max_level=3)
+
+        for level in space.levels:
+            for index in range(len(level)):
+                excited = simplify(expand(space.operator(level.level, index) * reference))
+                ket = space.ket(level.level, index)
+
+                if level.phases[index] < 0:
+                    ket = -ket
+                self.assertEqual(excited, ket)
+
+    def test_reference_sign(self):
+        space = excitations(FermionKet(b, a), orbitals, max_level=1)
+        self.assertEqual(int(space[0].phases[0]), -1)
+
+        space = excitations(FermionKet(b, a), [b, a, c], max_level=1)
+        self.assertEqual(int(space[0].phases[0]), 1)
+        self.assertEqual(int(space[1].phases[0]), -1)
+        self.assertEqual(simplify(expand(space.operator(1, 0) * FermionKet(b, a))), -space.ket(1, 0))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,6 @@
 import unittest
 
-from src.quant import Integer, Symbol, FermionKet, FermionCreation, FermionAnnihilation, FermionBra, expand
+from src.quant import Integer, Symbol, FermionKet, FermionCreation, FermionAnnihilation, FermionBra, Fd, F, expand, simplify, factors, terms, product
 
 a = Symbol("a")
 b = Symbol("b")
@@ -59,5 +59,49 @@ class TestExpand(unittest.TestCase):
             "([2⋅[b⋅[⟨c|⋅[c_a†⋅[c_a⋅|c⟩]]]]] + [d⋅[⟨c|⋅[c_b†⋅[c_b⋅|c⟩]]]])"
             )
 
+    def test_expand_max_order(self):
+        lam = Symbol("lam")
+        power = product([a + lam * b] * 6)
+
+        def order(term):
+            return sum(1 for factor in factors(term)[0] if factor == lam)
+
+        full = [repr(term) for term in terms(expand(power)) if order(term) <= 2]
+        truncated = [repr(term) for term in terms(expand(power, max_order={lam: 2}))]
+
+        self.assertEqual(len(truncated), 1 + 6 + 15)
+        self.assertEqual(sorted(truncated), sorted(full))
+
+    def test_expand_max_order_prunes_before_distributing(self):
+        lam = Symbol("lam")
+        power = product([a + lam * b] * 60)
+
+        result = list(terms(expand(power, max_order={lam: 1})))
+        self.assertEqual(len(result), 61)
+
+    def test_expand_max_order_large_result(self):
+        lam = Symbol("lam")
+        H0 = a + b + c + d + Fd(a) * F(b) + Fd(c) * F(d)
+        power = product([H0 + lam * Symbol("v")] * 4)
+
+        result = expand(power, max_order={lam: 1})
+        hash(result)
+        self.assertEqual(len(list(terms(simplify(result)))), 6 ** 4 + 4 * 6 ** 3)
+
+    def test_expand_max_order_signs(self):
+        lam = Symbol("lam")
+        self.assertEqual(repr(expand((a - lam * b) * (c - lam * d), max_order={lam: 1})), '(([a⋅c] - [a⋅[d⋅lam]]) - [c⋅[b⋅lam]])')
+        self.assertEqual(repr(expand(lam * (lam + a), max_order={lam: 0})), '0')
+
+    def test_expand_max_operators(self):
+        t = Symbol("t")
+        r = (Fd(a) + t) * (F(b) + t) * (Fd(c) + t)
+
+        self.assertEqual(
+            sorted(repr(term) for term in terms(expand(r, max_operators=1))),
+            sorted(['[t⋅[t⋅c_a†]]', '[t⋅[t⋅c_b]]', '[t⋅[t⋅c_c†]]', '[t⋅[t⋅t]]'])
+        )
+        self.assertEqual(len(list(terms(expand(r, max_operators=2)))), 7)
+
 if __name__ == '__main__':
     unittest.main()
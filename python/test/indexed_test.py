@@ -0,0 +1,89 @@
+import unittest
+
+from src.quant import Integer, Symbol, FermionKet, FermionBra, Fd, F, expand, simplify, terms
+from src.indexed import Index, IndexedSymbol, IndexedSum, unroll
+
+i = Index('i', 'site')
+j = Index('j', 'site')
+s = Index('s', 'spin')
+t = Symbol('t')
+
+def coefficient(expression):
+    return sum(
+        term.sign.number() for term in terms(expression)
+        if term != Integer.ZERO()
+    )
+
+lattice = {'site': range(3), 'spin': ['up', 'down']}
+
+class TestIndexedSum(unittest.TestCase):
+    def test_indexed_sum_repr(self):
+        hopping = IndexedSum(t * Fd(IndexedSymbol(i, s)) * F(IndexedSymbol(i + 1, s)), i, s)
+        self.assertEqual(repr(hopping), 'Σ_{i,s}[[t⋅c_i_s†]⋅c_i+1_s]')
+
+    def test_indexed_sum_unroll(self):
+        hopping = IndexedSum(t * Fd(IndexedSymbol(i, s)) * F(IndexedSymbol(i + 1, s)), i, s)
+        unrolled = list(terms(hopping.unroll(lattice)))
+
+        self.assertEqual(len(unrolled), 6)
+        self.assertEqual(repr(unrolled[0]), '[[t⋅c_0_up†]⋅c_1_up]')
+        self.assertEqual(repr(unrolled[-1]), '[[t⋅c_2_down†]⋅c_0_down]', 'periodic boundary')
+
+    def test_indexed_sum_unknown_space(self):
+        with self.assertRaises(ValueError):
+            IndexedSum(Fd(IndexedSymbol(i)), i).unroll({'spin': ['up']})
+
+    def test_normal_order_contracts_delta(self):
+        term = IndexedSum(t * F(IndexedSymbol(i)) * Fd(IndexedSymbol(j)), i, j)
+        self.assertEqual(repr(term.normal_order()), '(Σ_{j}t + Σ_{i,j}-[t⋅[c_j†⋅c_i]])')
+
+    def test_unroll_large_lattice(self):
+        hopping = IndexedSum(t * Fd(IndexedSymbol(i, s)) * F(IndexedSymbol(i + 1, s)), i, s)
+        unrolled = hopping.unroll({'site': range(600), 'spin': ['up', 'down']})
+
+        hash(unrolled)
+        self.assertEqual(sum(1 for _ in terms(expand(unrolled))), 1200)
+
+    def test_normal_order_fixes_concrete_index(self):
+        term = IndexedSum(F(IndexedSymbol(i, s)) * Fd(IndexedSymbol(j, 'up')), i, s)
+        self.assertEqual(repr(term.normal_order()), '(1 + Σ_{i,s}-[c_j_up†⋅c_i_s])')
+
+    def test_normal_order_shifted_indices_never_contract(self):
+        term = IndexedSum(F(IndexedSymbol(i, s)) * Fd(IndexedSymbol(i + 1, s)), i, s)
+        self.assertEqual(repr(term.normal_order()), 'Σ_{i,s}-[c_i+1_s†⋅c_i_s]')
+
+    def test_normal_order_matches_unrolled(self):
+        term = IndexedSum(t * F(IndexedSymbol(i, s)) * Fd(IndexedSymbol(j, s)), i, j, s)
+        small = {'site': range(2), 'spin': ['up', 'down']}
+
+        direct = unroll(term, small)
+        ordered = unroll(term.normal_order(), small)
+
+        for occupied in [(), ('0_up', ), ('0_up', '1_down'), ('0_up', '0_down', '1_up')]:
+            states = [Symbol(name) for name in occupied]
+            bra, ket = FermionBra(*states), FermionKet(*states)
+
+            self.assertEqual(
+                coefficient(simplify(expand(bra * direct * ket))),
+                coefficient(simplify(expand(bra * ordered * ket)))
+            )
+
+    def test_normal_order_keeps_delta_for_shifted_value(self):
+        term = IndexedSum(t * F(IndexedSymbol(i, j)) * Fd(IndexedSymbol(j + 1, 3)), i, j)
+        ordered = term.normal_order()
+        sites = {'site': range(4)}
+
+        direct = unroll(term, sites)
+        ordered = unroll(ordered, sites)
+
+        for occupied in [(), ('0_3', ), ('1_3', '3_2'), ('0_3', '1_0', '0_0')]:
+            states = [Symbol(name) for name in occupied]
+            bra, ket = FermionBra(*states), FermionKet(*states)
+
+            self.assertEqual(
+                coefficient(simplify(expand(bra * direct * ket))),
+                coefficient(simplify(expand(bra * ordered * ket)))
+            )
+
+if __name__ == '__main__':
+    unittest.main()
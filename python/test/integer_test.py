@@ -1,6 +1,6 @@
 import unittest
 
-from src.quant import Integer
+from src.quant import Integer, Sign, simplify
 
 
 class TestInteger(unittest.TestCase):
@@ -10,5 +10,10 @@ class TestInteger(unittest.TestCase):
         r = a + b
         self.assertEqual(repr(r.simplify()), '5')
 
+    def test_integer_imaginary(self):
+        self.assertEqual(repr(simplify(Integer(2, Sign.IMAGINARY) + Integer(3, Sign.NEGATIVE_IMAGINARY))), '-i⋅1')
+        self.assertEqual(repr(simplify(Integer(2, Sign.IMAGINARY) + Integer(2, Sign.NEGATIVE_IMAGINARY))), '0')
+        self.assertEqual(repr(simplify(Integer(2, Sign.IMAGINARY) + Integer(3))), '(i⋅2 + 3)')
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
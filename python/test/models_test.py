@@ -0,0 +1,79 @@
+import math
+import unittest
+from itertools import combinations
+
+import numpy
+
+from src.quant import Symbol, Addition, Multiplication, expand, term_count
+from src.numeric import apply, operator_terms
+from src.models import Lattice, chain, square, orbitals, hubbard, heisenberg
+
+t = Symbol('t')
+U = Symbol('U')
+J = Symbol('J')
+
+def spectrum(hamiltonian, lattice, n_particles, values, accept=lambda mask: True):
+    order = orbitals(lattice)
+    states = [
+        mask for mask in (sum(1 << i for i in c) for c in combinations(range(len(order)), n_particles))
+        if accept(mask)
+    ]
+    position = {s: i for i, s in enumerate(states)}
+    matrix = numpy.zeros((len(states), len(states)))
+
+    for coefficient, operators in operator_terms(hamiltonian, order, values):
+        for ket in states:
+            bra, sign = apply(ket, operators)
+            if sign != 0:
+                matrix[position[bra], position[ket]] += coefficient * sign
+
+    return numpy.linalg.eigvalsh(matrix)
+
+def depth(expression):
+    deepest, stack = 0, [(expression, 1)]
+    while len(stack) > 0:
+        node, level = stack.pop()
+        deepest = max(deepest, level)
+        if isinstance(node, (Addition, Multiplication)):
+            stack.extend([(node.lhs, level + 1), (node.rhs, level + 1)])
+    return deepest
+
+class TestLattices(unittest.TestCase):
+    def test_chain(self):
+        self.assertEqual(chain(4).bonds, ((0, 1), (1, 2), (2, 3), (3, 0)))
+        self.assertEqual(chain(4, periodic=False).bonds, ((0, 1), (1, 2), (2, 3)))
+        self.assertEqual(chain(2).bonds, ((0, 1),))
+
+    def test_square(self):
+        self.assertEqual(len(square(4, 3).bonds), 24)
+        self.assertEqual(len(square(4, 3, periodic=False).bonds), 17)
+
+class TestModels(unittest.TestCase):
+    def test_hubbard_dimer_spectrum(self):
+        hamiltonian = hubbard([(0, 1)], t, U)
+        energies = spectrum(hamiltonian, Lattice(2, ((0, 1),)), 2, {t: 1.0, U: 4.0})
+
+        expected = sorted([0, 0, 0, 4, 2 - 2 * math.sqrt(2), 2 + 2 * math.sqrt(2)])
+        numpy.testing.assert_allclose(energies, expected, atol=1e-12)
+
+    def test_heisenberg_dimer_spectrum(self):
+        lattice = chain(2)
+        singly_occupied = lambda mask: mask & 0b11 not in (0, 0b11)
+        energies = spectrum(heisenberg(lattice, J), lattice, 2, {J: 1.0}, singly_occupied)
+
+        numpy.testing.assert_allclose(energies, [-3, 1, 1, 1], atol=1e-12)
+
+    def test_integer_coefficients(self):
+        hamiltonian = heisenberg(chain(3), 3)
+        self.assertEqual(term_count(hamiltonian), 3 * 6)
+        self.assertEqual(repr(hubbard([(0, 1)], 1, 0)).count('-'), 1)
+
+    def test_large_lattice_is_balanced_and_expanded(self):
+        hamiltonian = hubbard(chain(5000), t, U)
+
+        self.assertEqual(term_count(hamiltonian), 5000 * 4 + 5000)
+        self.assertLess(depth(hamiltonian), 25)
+        self.assertEqual(hash(expand(hamiltonian)), hash(hamiltonian))
+
+if __name__ == '__main__':
+    unittest.main()
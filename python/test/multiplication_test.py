@@ -1,6 +1,6 @@
 import unittest
 
-from src.quant import Multiplication, Symbol, FermionKet, Integer
+from src.quant import Multiplication, Symbol, FermionKet, Integer, Fd, F
 
 a = Symbol("a")
 b = Symbol("b")
@@ -28,10 +28,23 @@ class TestMultiplication(unittest.TestCase):
     def test_multiply_ket_symbol(self):
         self.assertEqual(repr(FermionKet(b) * a), '[a⋅|b⟩]')
 
+    def test_multiply_keeps_shared_children(self):
+        neg_a = -a
+        self.assertEqual(repr(neg_a * b), neg_ab)
+        self.assertEqual(repr(neg_a), '-a')
+
     def test_multiply_symbol_number(self):
         number = Integer(3)
         self.assertEqual(repr(number * a), '[3⋅a]', 'Normal order')
         self.assertEqual(repr(a * number), '[3⋅a]', 'reverse Order')
 
+    def test_multiply_keeps_ends(self):
+        ket = FermionKet(b)
+        left = (a * F(b)) * ket
+        right = Multiplication(Fd(a), Multiplication(F(b), -ket))
+
+        self.assertEqual(repr((left.first, left.last)), '(a, |b⟩)')
+        self.assertEqual(repr((right.first, right.last)), '(c_a†, |b⟩)')
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
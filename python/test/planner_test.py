@@ -0,0 +1,78 @@
+import unittest
+
+from src.quant import Symbol, FermionKet, FermionBra, Fd, F, expand, simplify, term_count, terms, product
+from src.planner import Plan, Strategy, plan, execute
+from src.accumulator import Accumulator
+from src.writer import to_string
+
+a = Symbol("a")
+b = Symbol("b")
+c = Symbol("c")
+t = Symbol("t")
+u = Symbol("u")
+
+H = t * Fd(a) * F(b) + t * Fd(b) * F(a) + u * Fd(a) * F(a)
+
+class TestPlanner(unittest.TestCase):
+    def test_counts_terms_and_factors(self):
+        estimate = plan((a + b) * (c + t * u))
+
+        self.assertEqual(estimate.terms, 4)
+        # a⋅c, a⋅t⋅u, b⋅c, b⋅t⋅u: 10 factors, 6 products and 3 additions
+        self.assertEqual(estimate.nodes, 19)
+        self.assertGreater(estimate.bytes, 0)
+        self.assertEqual(estimate.strategy, Strategy.IN_MEMORY)
+
+    def test_terms_match_term_count(self):
+        expression = FermionBra(a) * H * H * FermionKet(b)
+        self.assertEqual(plan(expression).terms, term_count(expression))
+
+    def test_large_power_is_not_expanded(self):
+        power = product([a + b] * 40)
+        estimate = execute(power, dry_run=True, workers=4)
+
+        self.assertIsInstance(estimate, Plan)
+        self.assertEqual(estimate.terms, 2 ** 40)
+        self.assertEqual(estimate.strategy, Strategy.PARALLEL)
+        self.assertFalse(estimate.fits)
+
+    def test_strategy_choice(self):
+        power = product([a + b] * 10)
+
+        self.assertEqual(plan(power).strategy, Strategy.STREAMING)
+        self.assertEqual(plan(product([a + b] * 14), workers=1).strategy, Strategy.STREAMING)
+        self.assertEqual(plan(product([a + b] * 14), workers=4).strategy, Strategy.PARALLEL)
+        self.assertEqual(plan(a + b, memory_limit=0).strategy, Strategy.STREAMING)
+
+    def test_execute_matches_simplify(self):
+        expression = FermionBra(a) * H * FermionKet(a) + FermionBra(b) * H * FermionKet(a)
+        self.assertEqual(execute(expression), simplify(expand(expression)))
+
+        power = product([a + b] * 8)
+        self.assertEqual(plan(power).strategy, Strategy.IN_MEMORY)
+        self.assertEqual(
+            sorted(to_string(term) for term in terms(execute(power))),
+            sorted(to_string(term) for term in terms(execute(power, memory_limit=0, force=True)))
+        )
+
+    def test_refuses_plans_that_do_not_fit(self):
+        power = product([a + b] * 40)
+
+        with self.assertRaises(ValueError):
+            execute(power, workers=4)
+        with self.assertRaises(ValueError):
+            execute(product([a + b] * 6), memory_limit=0)
+
+    def test_streams_into_accumulator(self):
+        power = product([a + b] * 6)
+
+        with Accumulator(memory_limit=0) as accumulator:
+            self.assertIs(execute(power, memory_limit=0, output=accumulator), accumulator)
+            self.assertEqual(sum(coefficient for _, coefficient in accumulator.items()), 2 ** 6)
+
+    def test_max_terms(self):
+        with self.assertRaises(ValueError):
+            execute(product([a + b] * 20), max_terms=1000)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+import unittest
+
+import numpy
+
+from src.quant import Integer, Symbol, Sign, Fd, F
+from src.qubit import PauliString, QubitOperator, Encoding, jordan_wigner, bravyi_kitaev, transform
+
+a = Symbol("a")
+b = Symbol("b")
+c = Symbol("c")
+t = Symbol("t")
+u = Symbol("u")
+
+PAULI = {
+    'I': numpy.eye(2),
+    'X': numpy.array([[0, 1], [1, 0]]),
+    'Y': numpy.array([[0, -1j], [1j, 0]]),
+    'Z': numpy.diag([1, -1]),
+}
+
+def dense(operator):
+    # qubit 0 is the most significant factor of the kronecker product
+    matrix = numpy.zeros((2 ** operator.n_qubits, ) * 2, dtype=complex)
+    for label, coefficient in operator.labels():
+        term = numpy.eye(1)
+        for character in label:
+            term = numpy.kron(term, PAULI[character])
+        matrix += coefficient * term
+    return matrix
+
+def anticommutator(lhs, rhs):
+    return (lhs * rhs + rhs * lhs).compress()
+
+class TestPauliString(unittest.TestCase):
+    def test_pauli_multiplication(self):
+        x = PauliString(x=1)
+        z = PauliString(z=1)
+        self.assertEqual(x * z, PauliString(1, 1, 0))
+        self.assertEqual(z * x, PauliString(1, 1, 2))
+        self.assertEqual((x * z) * (x * z), PauliString(0, 0, 2))
+
+    def test_pauli_label(self):
+        self.assertEqual(PauliString(0b011, 0b110).label(3), ('XYZ', -1j))
+
+class TestJordanWigner(unittest.TestCase):
+    def test_number_operator(self):
+        self.assertEqual(jordan_wigner(Fd(a) * F(a)).labels(), [('I', 0.5), ('Z', -0.5)])
+
+    def test_creation_operator(self):
+        self.assertEqual(jordan_wigner(Fd(b), [a, b]).labels(), [('ZX', 0.5), ('ZY', -0.5j)])
+        self.assertEqual(jordan_wigner(F(b), [a, b]).labels(), [('ZX', 0.5), ('ZY', 0.5j)])
+
+    def test_hopping_merges_strings(self):
+        hopping = jordan_wigner(t * Fd(a) * F(b) + t * Fd(b) * F(a), values={t: -1.0})
+        self.assertEqual(sorted(hopping.labels()), [('XX', -0.5), ('YY', -0.5)])
+
+    def test_imaginary_hopping_is_hermitian(self):
+        it = Symbol('t', Sign.IMAGINARY)
+        current = jordan_wigner(it * Fd(a) * F(b) - it * Fd(b) * F(a), values={t: 1.0})
+
+        self.assertEqual(sorted(current.labels()), [('XY', -0.5), ('YX', 0.5)])
+        matrix = dense(current)
+        numpy.testing.assert_allclose(matrix, matrix.conj().T)
+
+    def test_missing_symbol_value(self):
+        with self.assertRaises(ValueError):
+            jordan_wigner(t * Fd(a) * F(a))
+
+    def test_to_arrays(self):
+        x, z, coefficients = jordan_wigner(Fd(a) * F(b), [a, b]).to_arrays()
+        self.assertEqual(len(x), 4)
+        self.assertEqual(x.dtype, numpy.uint64)
+        self.assertEqual(coefficients.dtype, complex)
+
+class TestEncodings(unittest.TestCase):
+    def test_anticommutation_relations(self):
+        for n_qubits in (4, 5):
+            for encoding in (Encoding.jordan_wigner(n_qubits), Encoding.bravyi_kitaev(n_qubits)):
+                modes = [Symbol(f'm{i}') for i in range(n_qubits)]
+                create = [transform(Fd(m), encoding, modes) for m in modes]
+                annihilate = [transform(F(m), encoding, modes) for m in modes]
+
+                for i in range(n_qubits):
+                    for j in range(n_qubits):
+                        expected = [(0, 0)] if i == j else []
+                        self.assertEqual(list(anticommutator(annihilate[i], create[j]).terms), expected)
+                        self.assertEqual(len(anticommutator(annihilate[i], annihilate[j])), 0)
+
+    def test_bravyi_kitaev_spectrum_matches_jordan_wigner(self):
+        H = (
+            t * Fd(a) * F(b) + t * Fd(b) * F(a) + t * Fd(b) * F(c) + t * Fd(c) * F(b)
+            + u * Fd(a) * F(a) * Fd(c) * F(c) + Integer(2) * Fd(b) * F(b)
+        )
+        values = {t: -1.0, u: 3.0}
+
+        jw = numpy.linalg.eigvalsh(dense(jordan_wigner(H, values=values)))
+        bk = numpy.linalg.eigvalsh(dense(bravyi_kitaev(H, values=values)))
+
+        numpy.testing.assert_allclose(jw, bk, atol=1e-12)
+
+    def test_closed_forms_match_matrix_inverse(self):
+        for n in range(1, 40):
+            fenwick = [((1 << (i + 1)) - 1) ^ ((1 << (i & (i + 1))) - 1) for i in range(n)]
+            cases = [
+                (Encoding.jordan_wigner(n), Encoding([1 << i for i in range(n)])),
+                (Encoding.bravyi_kitaev(n), Encoding(fenwick)),
+            ]
+
+            for fast, generic in cases:
+                self.assertEqual(fast.n_qubits, generic.n_qubits)
+                self.assertEqual(fast.update, generic.update)
+                self.assertEqual(fast.parity, generic.parity)
+                self.assertEqual(fast.occupation, generic.occupation)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import unittest
+from itertools import product
+
+import numpy
+
+from src.quant import Integer, Symbol, FermionKet, FermionBra, Fd, F, expand, simplify
+from src.rdm import density_matrices
+
+orbitals = [Symbol(name) for name in 'abcd']
+a, b, c, d = orbitals
+
+state = [(2, FermionKet(a, b)), (-1, FermionKet(a, c)), (3, FermionKet(b, d)), (1, FermionKet(c, d))]
+
+def number(expression):
+    if isinstance(expression, Integer):
+        return expression.sign.number() * expression.number
+    raise AssertionError(f'{expression} is not a number')
+
+def expectation(operators):
+    total = 0
+    for (bra_coefficient, bra), (ket_coefficient, ket) in product(state, state):
+        term = FermionBra(*bra.state)
+        for operator in operators:
+            term = term * operator
+        total += bra_coefficient * ket_coefficient * number(simplify(expand(term * ket)))
+    return total
+
+class TestDensityMatrices(unittest.TestCase):
+    def test_one_particle_matches_symbolic(self):
+        rdm1, _ = density_matrices(state, orbitals)
+
+        for p, q in product(range(4), repeat=2):
+            self.assertEqual(rdm1[p, q], expectation([Fd(orbitals[p]), F(orbitals[q])]), (p, q))
+
+    def test_two_particle_matches_symbolic(self):
+        _, rdm2 = density_matrices(state, orbitals)
+
+        for p, q, r, s in product(range(4), repeat=4):
+            expected = expectation([Fd(orbitals[p]), Fd(orbitals[q]), F(orbitals[s]), F(orbitals[r])])
+            self.assertEqual(rdm2[p, q, r, s], expected, (p, q, r, s))
+
+    def test_state_as_expression(self):
+        expression = Integer(2) * FermionKet(a, b) - FermionKet(a, c) + Integer(3) * FermionKet(b, d) + FermionKet(c, d)
+
+        expected = density_matrices(state, orbitals)
+        result = density_matrices(expression)
+
+        numpy.testing.assert_array_equal(result[0], expected[0])
+        numpy.testing.assert_array_equal(result[1], expected[1])
+
+    def test_trace(self):
+        rdm1, rdm2 = density_matrices(state, orbitals)
+        norm = sum(coefficient ** 2 for coefficient, _ in state)
+
+        self.assertEqual(numpy.trace(rdm1), 2 * norm)
+        self.assertEqual(numpy.einsum('pqpq', rdm2), 2 * norm)
+
+    def test_complex_coefficients(self):
+        rdm1, _ = density_matrices([(1j, FermionKet(a)), (1, FermionKet(b))], [a, b])
+        numpy.testing.assert_array_equal(rdm1, [[1, -1j], [1j, 1]])
+
+if __name__ == '__main__':
+    unittest.main()
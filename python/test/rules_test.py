@@ -0,0 +1,92 @@
+import unittest
+
+from src.quant import (
+    Integer,
+    Symbol,
+    Sign,
+    Operator,
+    Multiplication,
+    FermionKet,
+    FermionBra,
+    Fd,
+    F,
+    SIMPLIFY_RULES,
+    expand,
+    simplify,
+)
+from src.rules import RuleRegistry
+
+a = Symbol("a")
+b = Symbol("b")
+
+class Projector(Operator):
+    def __init__(self, name, sign=Sign.POSITIVE):
+        super().__init__(name, sign=sign)
+
+    def copy(self):
+        return Projector(self.name, self.sign)
+
+def idempotence(node):
+    if node.lhs.name == node.rhs.name:
+        return node.rhs.mul_sign(node.sign)
+    return None
+
+def nested_idempotence(node):
+    if isinstance(node.rhs.lhs, Projector) and node.rhs.lhs.name == node.lhs.name:
+        return node.rhs.mul_sign(node.sign)
+    return None
+
+class TestRuleRegistry(unittest.TestCase):
+    def test_dispatch_by_shape(self):
+        names = lambda node: [f.__name__ for f in SIMPLIFY_RULES.candidates(node)]
+
+        self.assertEqual(names(a), [])
+        self.assertEqual(names(Integer(2) + Integer(3)), ['_add_integers', '_drop_zero_lhs', '_drop_zero_rhs'])
+        self.assertEqual(
+            names(Multiplication(FermionBra(a), FermionKet(a))),
+            ['_apply_fermion_operators', '_inner_product']
+        )
+        self.assertNotIn('_inner_product', names(Fd(a) * F(b)))
+
+    def test_user_rules(self):
+        P = Projector('P')
+        Q = Projector('Q')
+
+        self.assertEqual(repr(simplify(P * P)), '[P⋅P]')
+
+        SIMPLIFY_RULES.register(Multiplication, Projector, Projector)(idempotence)
+        SIMPLIFY_RULES.register(Multiplication, Projector, Multiplication)(nested_idempotence)
+        self.addCleanup(SIMPLIFY_RULES.remove, idempotence)
+        self.addCleanup(SIMPLIFY_RULES.remove, nested_idempotence)
+
+        self.assertEqual(repr(simplify(P * P)), 'P')
+        self.assertEqual(repr(simplify(-(P * Q))), '-[P⋅Q]')
+        self.assertEqual(repr(simplify(expand(P * P * P * Q))), '[P⋅Q]')
+
+    def test_priority_and_removal(self):
+        registry = RuleRegistry('test')
+        calls = []
+
+        @registry.register(Symbol)
+        def late(node):
+            calls.append('late')
+            return None
+
+        @registry.register(Symbol, priority=-1)
+        def early(node):
+            calls.append('early')
+            return node
+
+        self.assertIs(registry.apply(a), a)
+        self.assertEqual(calls, ['early'])
+
+        registry.remove(early)
+        self.assertIsNone(registry.apply(a))
+        self.assertEqual(calls, ['early', 'late'])
+        self.assertEqual(len(registry), 1)
+
+        with self.assertRaises(ValueError):
+            registry.remove(early)
+
+if __name__ == '__main__':
+    unittest.main()
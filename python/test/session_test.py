@@ -0,0 +1,77 @@
+import unittest
+
+from src.quant import Integer, Symbol, FermionKet, FermionBra, Fd, F, expand, simplify, terms
+from src.writer import to_string
+from src.session import Session
+
+a = Symbol("a")
+b = Symbol("b")
+t = Symbol("t")
+u = Symbol("u")
+
+class TestSession(unittest.TestCase):
+    def test_session_matches_full_simplification(self):
+        B = FermionBra(a)
+        K = FermionKet(a)
+        H = Integer(2) * t * Fd(a) * F(a) + u * Fd(b) * F(b)
+
+        session = Session(B, K)
+        session += H
+
+        self.assertEqual(repr(session.result()), repr(simplify(expand(B * H * K))))
+        self.assertEqual(repr(session.result()), '[2⋅t]')
+
+    def test_session_add_term(self):
+        session = Session(FermionBra(a, b), FermionKet(a, b))
+        session.add(t * Fd(a) * F(a))
+        session.add(u * Fd(b) * F(b))
+
+        self.assertEqual(len(session), 2)
+        self.assertEqual(repr(session.result()), '(t + u)')
+
+    def test_session_remove_term(self):
+        session = Session(FermionBra(a, b), FermionKet(a, b))
+        key, = session.add(t * Fd(a) * F(a))
+        session.add(u * Fd(b) * F(b))
+
+        self.assertEqual(repr(session.remove(key)), '[[t⋅c_a†]⋅c_a]')
+        self.assertEqual(len(session), 1)
+        self.assertEqual(repr(session.result()), 'u')
+
+    def test_session_replace_term(self):
+        session = Session(FermionBra(a), FermionKet(a))
+        key, = session.add(t * Fd(a) * F(a))
+        session.replace(key, u * Fd(a) * F(a))
+
+        self.assertEqual(repr(session.result()), 'u')
+
+    def test_session_only_normalizes_edit(self):
+        session = Session(FermionBra(a), FermionKet(a))
+        session.add(t * Fd(a) * F(a) + u * Fd(b) * F(b))
+
+        calls = []
+        normalize = session.normalize
+        session.normalize = lambda term: calls.append(term) or normalize(term)
+        session.add(Integer(3) * Fd(a) * F(a))
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(repr(session.result()), '(t + 3)')
+
+    def test_session_many_terms(self):
+        session = Session()
+        keys = [key for n in range(1200) for key in session.add(Integer(1) * Symbol(f's{n}'))]
+
+        for key in keys[::2]:
+            session.remove(key)
+        session.add(t)
+
+        result = session.result()
+        names = sorted(to_string(term) for term in terms(simplify(result)))
+        self.assertEqual(names, sorted([f's{n}' for n in range(1, 1200, 2)] + ['t']))
+        self.assertIn('s1199', repr(result))
+
+    def test_session_empty(self):
+        self.assertEqual(Session().result(), Integer.ZERO())
+
+if __name__ == '__main__':
+    unittest.main()
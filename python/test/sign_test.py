@@ -1,3 +1,4 @@
+import pickle
 import unittest
 
 from src.quant import Sign
@@ -19,6 +20,53 @@ class TestSign(unittest.TestCase):
         self.assertEqual(Sign.NEGATIVE * Sign.POSITIVE, Sign.NEGATIVE)
         self.assertEqual(Sign.POSITIVE * Sign.POSITIVE, Sign.POSITIVE)
 
+    def test_imaginary_phases(self):
+        self.assertEqual(Sign.IMAGINARY * Sign.IMAGINARY, Sign.NEGATIVE)
+        self.assertEqual(Sign.IMAGINARY * Sign.NEGATIVE_IMAGINARY, Sign.POSITIVE)
+        self.assertEqual(-Sign.IMAGINARY, Sign.NEGATIVE_IMAGINARY)
+        self.assertEqual(Sign.IMAGINARY.conjugate(), Sign.NEGATIVE_IMAGINARY)
+        self.assertEqual(Sign.NEGATIVE.conjugate(), Sign.NEGATIVE)
+        self.assertEqual(str(Sign.NEGATIVE_IMAGINARY), '-i⋅')
+
+        for lhs in (Sign.POSITIVE, Sign.IMAGINARY, Sign.NEGATIVE, Sign.NEGATIVE_IMAGINARY):
+            for rhs in (Sign.POSITIVE, Sign.IMAGINARY, Sign.NEGATIVE, Sign.NEGATIVE_IMAGINARY):
+                self.assertEqual((lhs * rhs).number(), lhs.number() * rhs.number())
+
+    def test_from_number(self):
+        self.assertIs(Sign.from_number(-3), Sign.NEGATIVE)
+        self.assertIs(Sign.from_number(2j), Sign.IMAGINARY)
+        self.assertIs(Sign.from_number(-1j), Sign.NEGATIVE_IMAGINARY)
+        with self.assertRaises(ValueError):
+            Sign.from_number(1 + 1j)
+
+    def test_sign_is_shared(self):
+        self.assertIs(Sign(2), Sign.NEGATIVE)
+        self.assertIs(Sign.IMAGINARY * Sign.IMAGINARY, Sign.NEGATIVE)
+        self.assertIs(pickle.loads(pickle.dumps(Sign.NEGATIVE_IMAGINARY)), Sign.NEGATIVE_IMAGINARY)
+
+    def test_sign_is_not_a_number(self):
+        self.assertTrue(Sign.POSITIVE)
+        self.assertNotEqual(Sign.POSITIVE, 0)
+        self.assertNotEqual(2, Sign.NEGATIVE)
+        self.assertEqual({Sign.NEGATIVE: 'x'}[Sign(2)], 'x')
+
+    def test_sign_times_number(self):
+        self.assertEqual(Sign.NEGATIVE * 3, -3)
+        self.assertEqual(3 * Sign.NEGATIVE, -3)
+        self.assertEqual(Sign.IMAGINARY * 2.0, 2j)
+        with self.assertRaises(TypeError):
+            Sign.NEGATIVE * object()
+
+    def test_enum_api(self):
+        self.assertEqual(list(Sign), [Sign.POSITIVE, Sign.IMAGINARY, Sign.NEGATIVE, Sign.NEGATIVE_IMAGINARY])
+        self.assertEqual(len(Sign), 4)
+        self.assertIs(Sign('-'), Sign.NEGATIVE)
+        self.assertIs(Sign(''), Sign.POSITIVE)
+        self.assertEqual(Sign.NEGATIVE.value, '-')
+        self.assertEqual(Sign.NEGATIVE_IMAGINARY.name, 'NEGATIVE_IMAGINARY')
+        with self.assertRaises(ValueError):
+            Sign('+')
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -7,6 +7,8 @@ from src.quant import (
     FermionCreation, 
     FermionAnnihilation, 
     FermionBra, 
+    Fd,
+    F,
     expand,
     simplify
     )
@@ -61,5 +63,64 @@ class TestSimplify(unittest.TestCase):
             )
 
 
+    def test_simplify_occupation_conflict_is_zero_in_one_pass(self):
+        K = FermionKet(b)
+
+        expanded_term = expand(c * Fd(a) * F(a) * Fd(b) * K)
+
+        self.assertEqual(expanded_term.simplify(), Integer(0))
+
+    def test_simplify_particle_number_mismatch_is_zero_in_one_pass(self):
+        B = FermionBra(a, b)
+        K = FermionKet(a)
+
+        expanded_term = expand(B * Fd(c) * F(c) * K)
+
+        self.assertEqual(expanded_term.simplify(), Integer(0))
+
+    def test_simplify_bra_occupation_mismatch_is_zero_in_one_pass(self):
+        B = FermionBra(c)
+        K = FermionKet(a)
+
+        expanded_term = expand(B * Fd(b) * F(a) * K)
+
+        self.assertEqual(expanded_term.simplify(), Integer(0))
+
+    def test_simplify_non_vanishing_string_is_kept(self):
+        B = FermionBra(b)
+        K = FermionKet(a)
+
+        self.assertEqual(repr(simplify(expand(B * Fd(b) * F(a) * K))), "1")
+
+    def test_simplify_operator_string_in_one_pass(self):
+        K = FermionKet(b, d)
+
+        expanded_term = expand(c * Fd(a) * F(b) * Fd(c) * F(d) * K)
+
+        self.assertEqual(repr(expanded_term.simplify()), "[c⋅|a, c⟩]")
+
+    def test_simplify_operator_string_matches_apply(self):
+        operators = [Fd(a), F(b), Fd(c), F(a), Fd(b), F(d)]
+        K = FermionKet(b, d)
+
+        for start in range(len(operators)):
+            for stop in range(start + 1, len(operators) + 1):
+                expected = K
+                for operator in reversed(operators[start:stop]):
+                    expected = operator.apply(expected) if expected != Integer(0) else expected
+
+                string = operators[start]
+                for operator in operators[start + 1:stop]:
+                    string = string * operator
+
+                self.assertEqual(repr(expand(string * K).simplify()), repr(expected))
+
+    def test_simplify_operator_string_on_bra(self):
+        B = FermionBra(a)
+
+        expanded_term = expand(B * Fd(a) * F(b))
+
+        self.assertEqual(repr(expanded_term.simplify()), "⟨b|")
+
 if __name__ == '__main__':
     unittest.main()
@@ -18,6 +18,14 @@ class TestSymbol(unittest.TestCase):
 
         self.assertEqual(min(b, a), a)
 
+    def test_symbol_is_immutable(self):
+        a = Symbol('a')
+
+        with self.assertRaises(AttributeError):
+            a.sign = -a.sign
+        with self.assertRaises(AttributeError):
+            a.name = 'b'
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,70 @@
+import unittest
+from itertools import combinations
+
+import numpy
+
+from src.quant import Symbol, Fd, F, summation
+from src.numeric import apply, operator_terms
+from src.symmetry import TranslationBasis, momentum_blocks
+
+t = Symbol('t')
+u = Symbol('u')
+values = {t: -1.0, u: 4.0}
+
+def ring(n_sites, n_flavors):
+    orbitals = [Symbol(f'{site}_{flavor}') for site in range(n_sites) for flavor in range(n_flavors)]
+    terms = []
+
+    for site in range(n_sites):
+        neighbour = (site + 1) % n_sites
+        for flavor in range(n_flavors):
+            i = orbitals[site * n_flavors + flavor]
+            j = orbitals[neighbour * n_flavors + flavor]
+            terms.append(t * Fd(i) * F(j))
+            terms.append(t * Fd(j) * F(i))
+
+        if n_flavors == 2:
+            up, down = orbitals[2 * site], orbitals[2 * site + 1]
+            terms.append(u * Fd(up) * F(up) * Fd(down) * F(down))
+
+    return summation(terms), orbitals
+
+def full_spectrum(hamiltonian, orbitals, n_particles):
+    states = [sum(1 << i for i in c) for c in combinations(range(len(orbitals)), n_particles)]
+    position = {s: i for i, s in enumerate(states)}
+    matrix = numpy.zeros((len(states), len(states)))
+
+    for coefficient, operators in operator_terms(hamiltonian, orbitals, values):
+        for ket in states:
+            bra, sign = apply(ket, operators)
+            if sign != 0:
+                matrix[position[bra], position[ket]] += coefficient * sign
+
+    return numpy.linalg.eigvalsh(matrix)
+
+class TestTranslationBasis(unittest.TestCase):
+    def test_translate_sign(self):
+        basis = TranslationBasis(3)
+        self.assertEqual(basis.translate(0b001), (0b010, 1))
+        self.assertEqual(basis.translate(0b101), (0b011, -1))
+
+    def test_sector_sizes_add_up(self):
+        basis = TranslationBasis(4, 2, 3)
+        sizes = [len(basis.sector(k)) for k in range(4)]
+        self.assertEqual(sum(sizes), 56)
+
+    def test_blocks_reproduce_spectrum(self):
+        for n_sites, n_flavors, n_particles in [(4, 1, 2), (5, 1, 2), (4, 2, 3), (3, 2, 2)]:
+            hamiltonian, orbitals = ring(n_sites, n_flavors)
+            blocks = momentum_blocks(hamiltonian, orbitals, n_sites, n_particles, values)
+
+            for block in blocks.values():
+                numpy.testing.assert_allclose(block, block.conj().T, atol=1e-12)
+
+            spectrum = numpy.sort(numpy.concatenate([
+                numpy.linalg.eigvalsh(block) for block in blocks.values()
+            ]))
+            numpy.testing.assert_allclose(spectrum, full_spectrum(hamiltonian, orbitals, n_particles), atol=1e-10)
+
+if __name__ == '__main__':
+    unittest.main()
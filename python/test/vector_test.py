@@ -28,6 +28,15 @@ class TestKet(unittest.TestCase):
         ket = Ket({b: 1, a: 3})
         self.assertEqual(repr(ket), '|b, a:3⟩')
 
+    def test_ket_state_is_read_only(self):
+        a = Symbol('a')
+        ket = FermionKet(a)
+
+        with self.assertRaises(TypeError):
+            ket.state[Symbol('b')] = 1
+        with self.assertRaises(AttributeError):
+            ket.state = {}
+
 class TestFermionKet(unittest.TestCase):
     def test_fket_init(self):
         a = Symbol('a')
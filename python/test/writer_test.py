@@ -0,0 +1,70 @@
+import io
+import unittest
+
+try:
+    from IPython.core.formatters import DisplayFormatter
+except ImportError:
+    DisplayFormatter = None
+
+from src.quant import Integer, Symbol, FermionKet, FermionBra, Fd, F, expand, summation, balanced_summation
+from src.writer import write, to_string, count_terms, summary
+
+a = Symbol("a")
+b = Symbol("b")
+c = Symbol("c")
+
+class TestWriter(unittest.TestCase):
+    def test_write_matches_repr(self):
+        expressions = [
+            a * (b - c),
+            -(a + b),
+            (-a) * (-b - c),
+            FermionBra(b) * c * Fd(a) * F(a) * FermionKet(b, a),
+            expand(FermionBra(c) * (Integer(2) * b * Fd(a) * F(a) - a * Fd(b) * F(b)) * FermionKet(c)),
+        ]
+
+        for expression in expressions:
+            self.assertEqual(to_string(expression), repr(expression))
+
+    def test_write_deep_expression(self):
+        expression = a
+        for i in range(20000):
+            expression = expression + Symbol(f'x{i}')
+
+        stream = io.StringIO()
+        write(expression, stream)
+
+        self.assertTrue(stream.getvalue().startswith('(' * 20000 + 'a + x0)'))
+        self.assertEqual(count_terms(expression), 20001)
+
+    def test_write_latex(self):
+        expression = FermionBra(b) * Fd(a) * F(b) * FermionKet(b)
+        self.assertEqual(
+            to_string(expression, latex=True),
+            r'\left\langle b\right| \, c^{\dagger}_{a} \, c_{b} \, \left|b\right\rangle'
+        )
+        self.assertEqual(to_string(a - b, latex=True), r'\left(a - b\right)')
+
+    def test_summary_truncates(self):
+        expression = a - b + c + Symbol('d')
+        self.assertEqual(summary(expression, limit=2), 'a - b + …  (4 terms)')
+        self.assertEqual(summary(a * b), '[a⋅b]')
+
+    def test_notebook_hooks(self):
+        expression = a + b
+        self.assertEqual(expression._repr_html_(), '<pre>a + b  (2 terms)</pre>')
+        self.assertEqual(expression._repr_latex_(), r'$a + b \quad \text{(2 terms)}$')
+
+    @unittest.skipIf(DisplayFormatter is None, 'IPython is not installed')
+    def test_notebook_display(self):
+        expression = balanced_summation(Symbol(f's{n}') for n in range(3000))
+        expression = summation([expression] + [Symbol(f't{n}') for n in range(3000)])
+
+        data, _ = DisplayFormatter().format(expression)
+
+        self.assertEqual(data['text/plain'], 's0 + s1 + s2 + s3 + s4 + …  (6000 terms)')
+        self.assertEqual(data['text/html'], '<pre>s0 + s1 + s2 + s3 + s4 + …  (6000 terms)</pre>')
+        self.assertIn('text/latex', data)
+
+if __name__ == '__main__':
+    unittest.main()